@@ -0,0 +1,29 @@
+# Measure the time for importing iarray_community and for creating (and reading) the first array
+# in a fresh interpreter, as paid by short-lived processes (CLI tools, serverless workers...)
+
+import subprocess
+import sys
+import numpy as np
+
+NRUNS = 10
+
+code = """
+import time
+t0 = time.perf_counter()
+import iarray_community as ia
+t1 = time.perf_counter()
+a = ia.zeros((100, 100), chunks=(50, 50), blocks=(25, 25))
+a[0, 0] = 1
+a[:10, :10]
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1)
+"""
+
+times = []
+for _ in range(NRUNS):
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    times.append([float(t) for t in out.split()])
+import_time, first_array = np.median(times, axis=0)
+print("Import time (median of %d): %.1f ms" % (NRUNS, import_time * 1e3))
+print("First array latency (median of %d): %.1f ms" % (NRUNS, first_array * 1e3))
+print("Total: %.1f ms" % ((import_time + first_array) * 1e3))
@@ -1,13 +1,46 @@
-from .iarray import IArray
-from .constructors import empty, zeros, ones, full
-from .config_params import (
-    Codec,
-    Filter,
-    Config,
-    config,
-    set_config_defaults,
-    reset_config_defaults,
-)
-from .utils import numpy2iarray, iarray2numpy, open, remove, copy, slice
+import importlib
 
 __version__ = '0.0.4'
+
+# The public names, and the submodules defining them.  Submodules (and caterva, NumPy, etc.)
+# are only imported when one of their names is first used, so importing the package is cheap.
+_lazy_names = {
+    "IArray": "iarray",
+    "ColumnArray": "columns",
+    "Store": "store",
+    "IArrayView": "views",
+    **dict.fromkeys(["empty", "zeros", "ones", "full", "arange", "linspace"], "constructors"),
+    **dict.fromkeys(["Codec", "Filter", "Config", "config", "set_config_defaults", "reset_config_defaults"],
+                    "config_params"),
+    **dict.fromkeys(["numpy2iarray", "iarray2numpy", "open", "from_cframe", "remove", "copy", "slice",
+                     "concatenate", "stack"], "utils"),
+    **dict.fromkeys(["to_npy", "from_npy", "to_hdf5", "from_hdf5", "to_zarr", "from_zarr"], "formats"),
+    "matmul": "linalg",
+    **dict.fromkeys(["histogram", "quantile", "sort", "argsort"], "statistics"),
+    "compress": "selection",
+    **dict.fromkeys(["map_overlap", "rolling"], "windows"),
+}
+
+# Star imports go through __getattr__ too
+__all__ = list(_lazy_names)
+
+_submodules = [
+    "buffers", "columns", "config_params", "constructors", "formats", "iarray", "info", "instrument",
+    "linalg", "numpy_api", "random", "reductions", "selection", "statistics", "store", "utils", "views",
+    "windows",
+]
+
+
+def __getattr__(name):
+    if name in _lazy_names:
+        value = getattr(importlib.import_module(f".{_lazy_names[name]}", __name__), name)
+    elif name in _submodules:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names) | set(_submodules))
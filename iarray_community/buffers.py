@@ -0,0 +1,108 @@
+import collections
+import threading
+import numpy as np
+import caterva as cat
+from .iarray import chunk_slices
+
+
+class WriteBuffer(object):
+    """Keep the chunks of `arr` being written to decompressed, and write them back later.
+
+    Chunks are kept in LRU order and written back to `arr` when the memory they take exceeds
+    `max_mem` (least recently used first) or on :meth:`flush`.  Each chunk is read at most once
+    (not at all when a write covers it entirely), and compressed and written once, no matter
+    how many writes it gets in the meantime.
+    """
+
+    def __init__(self, arr, max_mem):
+        self.arr = arr
+        self.max_mem = max_mem
+        self.chunks = collections.OrderedDict()
+        self.nbytes = 0
+
+    def _chunk_key(self, cstart):
+        return tuple(slice(s, min(s + c, n)) for s, c, n in zip(cstart, self.arr.chunks, self.arr.shape))
+
+    def _write_back(self, cstart):
+        data = self.chunks.pop(cstart)
+        self.nbytes -= data.nbytes
+        cstop = tuple(s + n for s, n in zip(cstart, data.shape))
+        cat.ext.set_slice(self.arr, (cstart, cstop), data)
+
+    def write(self, start, stop, value):
+        """Write `value` (with the shape of the region) in the region from `start` to `stop`.
+
+        Returns
+        -------
+        int
+            The number of chunks that were already in the buffer.
+        """
+        hits = 0
+        shape = tuple(sp - st for st, sp in zip(start, stop))
+        for key in chunk_slices(shape, self.arr.chunks, start):
+            cstart = tuple((st + k.start) // c * c for st, k, c in zip(start, key, self.arr.chunks))
+            ckey = self._chunk_key(cstart)
+            local = tuple(slice(st + k.start - ck.start, st + k.stop - ck.start)
+                          for st, k, ck in zip(start, key, ckey))
+            data = self.chunks.get(cstart)
+            if data is not None:
+                hits += 1
+                self.chunks.move_to_end(cstart)
+            else:
+                cshape = tuple(ck.stop - ck.start for ck in ckey)
+                data = np.empty(cshape, dtype=self.arr.dtype)
+                if any(lk.stop - lk.start != s for lk, s in zip(local, cshape)):
+                    # Only read the chunk when the write does not cover it entirely
+                    cstop = tuple(ck.stop for ck in ckey)
+                    cat.ext.get_slice_numpy(data.view(f"S{data.itemsize}"), self.arr, (cstart, cstop),
+                                            (False,) * data.ndim)
+                self.chunks[cstart] = data
+                self.nbytes += data.nbytes
+            data[local] = value[key]
+            # The chunk just written is the most recently used, so it is kept
+            while self.nbytes > self.max_mem and len(self.chunks) > 1:
+                self._write_back(next(iter(self.chunks)))
+        return hits
+
+    def flush(self, start=None, stop=None):
+        """Write back the chunks overlapping the region from `start` to `stop` (all by default)."""
+        for cstart in list(self.chunks):
+            ckey = self._chunk_key(cstart)
+            if start is None or all(ck.start < sp and st < ck.stop for ck, st, sp in zip(ckey, start, stop)):
+                self._write_back(cstart)
+
+
+class ChunkCache(object):
+    """Keep the most recently read chunks of `arr` decompressed, so tasks reading them can share them.
+
+    Chunks are read on first use and kept in LRU order while they take less than `max_mem`.
+    It can be used from several threads.
+    """
+
+    def __init__(self, arr, max_mem):
+        self.arr = arr
+        self.max_mem = max_mem
+        self.chunks = collections.OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.lock = threading.Lock()
+
+    def get(self, cstart):
+        """Return the data for the chunk starting at `cstart` (don't modify it)."""
+        with self.lock:
+            data = self.chunks.get(cstart)
+            if data is not None:
+                self.hits += 1
+                self.chunks.move_to_end(cstart)
+                return data
+        # Decompress without the lock, so other threads can go on
+        cstop = tuple(min(s + c, n) for s, c, n in zip(cstart, self.arr.chunks, self.arr.shape))
+        data = np.empty(tuple(sp - st for st, sp in zip(cstart, cstop)), dtype=self.arr.dtype)
+        cat.ext.get_slice_numpy(data.view(f"S{data.itemsize}"), self.arr, (cstart, cstop), (False,) * data.ndim)
+        with self.lock:
+            if cstart not in self.chunks:
+                self.chunks[cstart] = data
+                self.nbytes += data.nbytes
+                while self.nbytes > self.max_mem and len(self.chunks) > 1:
+                    self.nbytes -= self.chunks.popitem(last=False)[1].nbytes
+        return data
@@ -0,0 +1,149 @@
+import os
+import ast
+import msgpack
+import numpy as np
+import iarray_community as ia
+from .info import InfoReporter
+
+
+# Name of the file describing a persistent columnar array inside its directory
+COLUMNS_INDEX = ".iarray_columns"
+
+
+class ColumnArray(object):
+    """A structured array with every field stored in its own compressed :class:`IArray`.
+
+    Column arrays are created by passing ``columnar=True`` (see :class:`Config`) along with
+    a structured `dtype` to any constructor.  Getting a field by name returns its column, so
+    ``arr["value"][a:b]`` only decompresses the data for that field.
+    """
+
+    def __init__(self, columns, dtype, urlpath=None):
+        self._columns = columns
+        self._dtype = dtype
+        self.urlpath = urlpath
+
+    @classmethod
+    def create(cls, cfg, build):
+        """Create a column array by calling ``build(name, **kwargs)`` for every field in `cfg.dtype`."""
+        dtype = np.dtype(cfg.dtype)
+        for name in dtype.names:
+            # Field names are used for the file names of the columns
+            if name in ("", ".", "..") or "/" in name or (os.altsep and os.altsep in name):
+                raise ValueError(f"Invalid field name {name!r} for a columnar array")
+            if dtype.fields[name][0].shape != ():
+                raise ValueError(f"Field {name!r} is a subarray, which is not supported in columnar arrays")
+        urlpath = cfg.urlpath
+        if urlpath is not None:
+            if os.path.exists(urlpath):
+                raise FileExistsError("Remove file first!")
+            os.makedirs(urlpath)
+            descr = np.lib.format.dtype_to_descr(dtype)
+            with open(os.path.join(urlpath, COLUMNS_INDEX), "wb") as f:
+                f.write(msgpack.packb({"version": 0, "dtype": repr(descr)}))
+        columns = {}
+        for name in dtype.names:
+            col_urlpath = None if urlpath is None else os.path.join(urlpath, name + ".iarray")
+            columns[name] = build(name, dtype=dtype.fields[name][0], urlpath=col_urlpath, columnar=False)
+        return cls(columns, dtype, urlpath)
+
+    @classmethod
+    def open(cls, urlpath):
+        with open(os.path.join(urlpath, COLUMNS_INDEX), "rb") as f:
+            index = msgpack.unpackb(f.read())
+        dtype = np.lib.format.descr_to_dtype(ast.literal_eval(index["dtype"]))
+        columns = {name: ia.open(os.path.join(urlpath, name + ".iarray")) for name in dtype.names}
+        return cls(columns, dtype, urlpath)
+
+    @property
+    def columns(self):
+        """
+        A dictionary mapping the field names to their column arrays.
+        """
+        return self._columns
+
+    @property
+    def _first(self):
+        return self._columns[self._dtype.names[0]]
+
+    @property
+    def dtype(self):
+        """
+        The (structured) data type for the array.
+        """
+        return self._dtype
+
+    @property
+    def shape(self):
+        return self._first.shape
+
+    @property
+    def ndim(self):
+        return self._first.ndim
+
+    @property
+    def chunks(self):
+        return self._first.chunks
+
+    @property
+    def blocks(self):
+        return self._first.blocks
+
+    @property
+    def cratio(self):
+        nbytes = sum(col.size for col in self._columns.values())
+        cbytes = sum(col.size / col.cratio for col in self._columns.values())
+        return nbytes / cbytes
+
+    @property
+    def data(self):
+        """
+        Get a ndarray with array data.
+        """
+        return self[:]
+
+    @property
+    def info(self):
+        """
+        Print information about this array.
+        """
+        return InfoReporter(self)
+
+    @property
+    def info_items(self):
+        items = []
+        items += [("type", self.__class__.__name__)]
+        items += [("dtype", self.dtype)]
+        items += [("shape", self.shape)]
+        items += [("chunks", self.chunks)]
+        items += [("blocks", self.blocks)]
+        items += [("cratio", f"{self.cratio:.2f}")]
+        for name, col in self._columns.items():
+            items += [(f"cratio[{name}]", f"{col.cratio:.2f}")]
+        return items
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._columns[key]
+        fields = {name: col[key] for name, col in self._columns.items()}
+        out = np.empty(fields[self._dtype.names[0]].shape, dtype=self._dtype)
+        for name, value in fields.items():
+            out[name] = value
+        return out
+
+    def __setitem__(self, key, value):
+        if isinstance(key, str):
+            self._columns[key][...] = value
+            return
+        value = np.asarray(value, dtype=self._dtype)
+        for name, col in self._columns.items():
+            col[key] = value[name]
+
+    def copy(self, **kwargs):
+        kwargs.setdefault("columnar", True)
+        return ia.copy(self, **kwargs)
+
+    def resize(self, newshape):
+        for col in self._columns.values():
+            col.resize(newshape)
+        return self
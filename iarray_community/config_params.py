@@ -11,7 +11,7 @@
 
 import iarray_community as ia
 
-from dataclasses import dataclass, field, fields, replace, asdict
+from dataclasses import dataclass, field, fields, replace
 from typing import List, Sequence, Any, Union
 from contextlib import contextmanager
 import numpy as np
@@ -49,8 +49,26 @@ class DefaultConfig:
     dtype: Any
 
 
-def default_filters():
-    return [Filter.SHUFFLE]
+def _asdict(obj):
+    # Much faster than dataclasses.asdict (which deep copies every value); only lists
+    # (e.g. filters) are mutable here, so only they are copied
+    return {f.name: type(v)(v) if isinstance(v, list) else v
+            for f in fields(obj) for v in (getattr(obj, f.name),)}
+
+
+# Types getting BITSHUFFLE instead of the default filters
+half_dtypes = ("float16", "bfloat16")
+
+
+class _DefaultFilters(list):
+    # Filters not chosen by the user, which follow the dtype of the config
+    pass
+
+
+def default_filters(dtype=None):
+    if dtype is not None and np.dtype(dtype).name in half_dtypes:
+        return _DefaultFilters([Filter.BITSHUFFLE])
+    return _DefaultFilters([Filter.SHUFFLE])
 
 
 @dataclass
@@ -71,6 +89,7 @@ class Defaults(object):
     blocks: Sequence = None
     urlpath: bytes or str = None
     contiguous: bool = None
+    columnar: bool = False
 
     # Keep track of the special params set with default values for consistency checks with btune
     compat_params: set = field(default_factory=set)
@@ -145,6 +164,9 @@ class Defaults(object):
     def _contiguous(self):
         return self.contiguous
 
+    def _columnar(self):
+        return self.columnar
+
 
 # Global variable where the defaults for config params are stored
 defaults = Defaults()
@@ -179,9 +201,13 @@ class Config():
         The number of threads for internal ironArray operations.  This number can be
         silently capped to be the number of *logical* cores in the system.  If 0
         (the default), the number of logical cores in the system is used.
-    dtype: (np.float64, np.float32, np.int64, np.int32, np.int16, np.int8, np.uint64, np.uint32, np.uint16,
-        np.uint8, np.bool_)
-        The data type to use. The default is np.float64.
+    dtype: (np.float64, np.float32, np.float16, bfloat16, np.complex128, np.complex64, np.int64, np.int32,
+        np.int16, np.int8, np.uint64, np.uint32, np.uint16, np.uint8, np.bool_)
+        The data type to use. The default is np.float64.  bfloat16 is only available when the
+        `ml_dtypes` package is installed.  For half precision types (float16 and bfloat16),
+        the default filter list is replaced by [:py:obj:`Filter.BITSHUFFLE <Filter>`], which
+        compresses them much better than the byte shuffle; filters set explicitly are kept.
+        Structured dtypes whose fields are made of the types above are supported too.
     chunks : list, tuple
         The chunk shape for the output array.  If None (the default), a sensible default
         will be used based on the shape of the array and the size of caches in the current
@@ -197,6 +223,10 @@ class Config():
         If True, the output array will be stored contiguously, even when in-memory.  If False,
         the store will be sparse. The default value is False for in-memory and True for persistent
         storage.
+    columnar : bool
+        If True and `dtype` is structured, every field is stored in its own compressed array
+        (a column), so reading a single field does not need to decompress the others.  For
+        persistent arrays, `urlpath` becomes a directory holding the columns.  Default is False.
 
     See Also
     --------
@@ -210,12 +240,15 @@ class Config():
     fp_mantissa_bits: int = field(default_factory=defaults._fp_mantissa_bits)
     use_dict: bool = field(default_factory=defaults._use_dict)
     nthreads: int = field(default_factory=defaults._nthreads)
-    dtype: (np.float64, np.float32, np.int64, np.int32, np.int16, np.int8, np.uint64, np.uint32, np.uint16,
-            np.uint8, np.bool_) = field(default_factory=defaults._dtype)
+    # bfloat16 comes from the optional ml_dtypes package
+    dtype: (np.float64, np.float32, np.float16, "bfloat16", np.complex128, np.complex64, np.int64, np.int32,
+            np.int16, np.int8, np.uint64, np.uint32, np.uint16, np.uint8, np.bool_) = field(
+        default_factory=defaults._dtype)
     chunks: Union[Sequence, None] = field(default_factory=defaults._chunks)
     blocks: Union[Sequence, None] = field(default_factory=defaults._blocks)
     urlpath: bytes or str = field(default_factory=defaults._urlpath)
     contiguous: bool = field(default_factory=defaults._contiguous)
+    columnar: bool = field(default_factory=defaults._columnar)
 
     def __post_init__(self):
         if defaults.check_compat:
@@ -231,6 +264,11 @@ class Config():
             ncores = 1
             self.nthreads = ncores
 
+        # Half precision types compress better with bits (not bytes) shuffled, but filters
+        # set explicitly are kept
+        if isinstance(self.filters, _DefaultFilters):
+            self.filters = default_filters(self.dtype)
+
         # Activate TRUNC_PREC filter only if mantissa_bits > 0
         if self.fp_mantissa_bits != 0 and Filter.TRUNC_PREC not in self.filters:
             self.filters.insert(0, Filter.TRUNC_PREC)
@@ -246,7 +284,7 @@ class Config():
         return cfg_
 
     def __deepcopy__(self, memodict={}):
-        kwargs = asdict(self)
+        kwargs = _asdict(self)
         defaults.check_compat = False
         cfg = Config(**kwargs)
         return cfg
@@ -256,7 +294,7 @@ class Config():
 
     @property
     def kwargs(self):
-        return asdict(self)
+        return _asdict(self)
 
     @property
     def cat_kwargs(self):
@@ -270,12 +308,13 @@ class Config():
             'chunks': self.chunks,
             'blocks': self.blocks,
             'urlpath': self.urlpath,
-            'sequencial': self.contiguous
+            # Named 'sequencial' before caterva 0.7, which ignores unknown names
+            'contiguous': self.contiguous
         }
         return kwargs
 
-# Global config
-global_config = Config()
+# Global config (built on first use)
+global_config = None
 
 
 def get_config_defaults():
@@ -290,6 +329,9 @@ def get_config_defaults():
     --------
     set_config_defaults
     """
+    global global_config
+    if global_config is None:
+        global_config = Config()
     return global_config
 
 
@@ -1,7 +1,10 @@
 import struct
+import time
 
 import caterva as cat
-from .iarray import IArray, add_meta
+from . import instrument
+from .iarray import IArray, add_meta, chunk_slices, imap_chunks
+from .columns import ColumnArray
 from .config_params import *
 
 
@@ -24,11 +27,15 @@ def empty(shape, **kwargs):
     IArray
         The new array.
     """
+    t0 = time.perf_counter()
     with config(**kwargs) as cfg:
         dtype = np.dtype(cfg.dtype)
+        if cfg.columnar and dtype.names is not None:
+            return ColumnArray.create(cfg, lambda name, **kw: empty(shape, **kw))
         arr = IArray(**cfg.kwargs)
         kwargs = add_meta(dtype, **arr._cfg.cat_kwargs)
         cat.ext.empty(arr, shape, dtype.itemsize, **kwargs)
+    instrument.emit("create", arr, t0)
     return arr
 
 
@@ -47,11 +54,15 @@ def zeros(shape, **kwargs):
     empty : Create an empty array.
     ones : Create an array filled with ones.
     """
+    t0 = time.perf_counter()
     with config(**kwargs) as cfg:
         dtype = np.dtype(cfg.dtype)
+        if cfg.columnar and dtype.names is not None:
+            return ColumnArray.create(cfg, lambda name, **kw: zeros(shape, **kw))
         arr = IArray(**cfg.kwargs)
         kwargs = add_meta(dtype, **arr._cfg.cat_kwargs)
         cat.ext.zeros(arr, shape, dtype.itemsize, **kwargs)
+    instrument.emit("create", arr, t0)
     return arr
 
 
@@ -70,12 +81,17 @@ def full(shape, fill_value, **kwargs):
     empty : Create an empty array.
     zeros : Create an array filled with zeros.
     """
+    t0 = time.perf_counter()
     with config(**kwargs) as cfg:
         dtype = np.dtype(cfg.dtype)
+        if cfg.columnar and dtype.names is not None:
+            fill_value = np.array(fill_value, dtype=dtype)
+            return ColumnArray.create(cfg, lambda name, **kw: full(shape, fill_value[name], **kw))
         arr = IArray(**cfg.kwargs)
         kwargs = add_meta(arr.dtype, **arr._cfg.cat_kwargs)
-        fill_bytes = dtype.type(fill_value).tobytes()
+        fill_bytes = np.array(fill_value, dtype=dtype).tobytes()
         cat.ext.full(arr, shape, fill_bytes, **kwargs)
+    instrument.emit("create", arr, t0)
     return arr
 
 
@@ -96,3 +112,114 @@ def ones(shape, **kwargs):
     """
     return full(shape, 1., **kwargs)
 
+
+
+def fill_chunks(arr, func):
+    """Fill `arr` with the data returned by ``func(index, key)`` for every chunk.
+
+    `index` is the position of the chunk in C order and `key` its tuple of slices.  The data for
+    the chunks is computed with :func:`imap_chunks` (using the `nthreads` of `arr`) and only a
+    few chunks are kept in memory at a time.
+    """
+    keys = list(chunk_slices(arr.shape, arr.chunks))
+    chunks = imap_chunks(lambda item: func(*item), enumerate(keys), arr._nthreads)
+    for key, data in zip(keys, chunks):
+        arr[key] = data
+    return arr
+
+
+def flat_index(key, shape):
+    """Return the indices in the flattened (C order) array with `shape` for the region in `key`."""
+    strides = np.cumprod((tuple(shape[1:]) + (1,))[::-1])[::-1]
+    grids = np.ix_(*[np.arange(k.start, k.stop, dtype=np.int64) for k in key])
+    return sum((g * s for g, s in zip(grids, strides)), np.zeros((), dtype=np.int64))
+
+
+def _ramp_shape(shape, num):
+    if shape is None:
+        return (num,)
+    if int(np.prod(shape)) != num:
+        raise ValueError(f"Cannot fit {num} elements in an array of shape {tuple(shape)}")
+    return tuple(shape)
+
+
+def arange(start, stop=None, step=1, shape=None, **kwargs):
+    """Return evenly spaced values within the interval ``[start, stop)``.
+
+    Each chunk is computed on its own, so the values are never all in memory.
+
+    Parameters
+    ----------
+    start : number
+        The start of the interval.  If `stop` is None, this is the stop and the start is 0.
+    stop : number
+        The end of the interval (not included).
+    step : number
+        The spacing between values.  Default is 1.
+    shape : tuple, list
+        The shape of the array to be created.  The values are laid out in C order.  If None
+        (the default), a 1-dim array is created.
+    kwargs : dict
+        A dictionary for setting some or all of the fields in the Config
+        dataclass that should override the current configuration.
+
+    Returns
+    -------
+    IArray
+        The new array.
+
+    See Also
+    --------
+    linspace
+    """
+    if stop is None:
+        start, stop = 0, start
+    num = max(int(np.ceil((stop - start) / step)), 0)
+    arr = empty(_ramp_shape(shape, num), **kwargs)
+    return fill_chunks(arr, lambda index, key: start + flat_index(key, arr.shape) * step)
+
+
+def linspace(start, stop, num=50, endpoint=True, shape=None, **kwargs):
+    """Return `num` evenly spaced values over the interval ``[start, stop]``.
+
+    Each chunk is computed on its own, so the values are never all in memory.
+
+    Parameters
+    ----------
+    start : number
+        The start of the interval.
+    stop : number
+        The end of the interval.
+    num : int
+        The number of values.  Default is 50.
+    endpoint : bool
+        Whether `stop` is the last value.  Default is True.
+    shape : tuple, list
+        The shape of the array to be created.  The values are laid out in C order.  If None
+        (the default), a 1-dim array is created.
+    kwargs : dict
+        A dictionary for setting some or all of the fields in the Config
+        dataclass that should override the current configuration.
+
+    Returns
+    -------
+    IArray
+        The new array.
+
+    See Also
+    --------
+    arange
+    """
+    div = (num - 1) if endpoint else num
+    step = (stop - start) / div if div > 0 else 0.
+    arr = empty(_ramp_shape(shape, num), **kwargs)
+
+    def ramp(index, key):
+        flat = flat_index(key, arr.shape)
+        values = start + flat * step
+        if endpoint and num > 1:
+            # Like NumPy, make sure that the last value is exactly `stop`
+            values = np.where(flat == num - 1, stop, values)
+        return values
+
+    return fill_chunks(arr, ramp)
@@ -0,0 +1,147 @@
+import numpy as np
+import iarray_community as ia
+from .iarray import chunk_slices, imap_chunks
+from .constructors import fill_chunks
+
+
+# Approximate maximum size (in bytes) of the default chunks and blocks for imported arrays
+IMPORT_CHUNK_NBYTES = 2**22
+IMPORT_BLOCK_NBYTES = 2**18
+
+
+def _halve(shape, itemsize, nbytes):
+    # Halve the largest dimension of `shape` until it takes at most `nbytes`
+    shape = [max(s, 1) for s in shape]
+    while shape and int(np.prod(shape)) * itemsize > nbytes and max(shape) > 1:
+        i = shape.index(max(shape))
+        shape[i] = (shape[i] + 1) // 2
+    return tuple(shape)
+
+
+def _source_config(shape, source_chunks, itemsize, **kwargs):
+    # Use the chunks of the source when none are given, or chunks of at most 4 MB when the source
+    # is not chunked, with blocks of at most 256 KB
+    with ia.config(**kwargs) as cfg:
+        if cfg.chunks is None and cfg.blocks is None:
+            if source_chunks is None:
+                source_chunks = _halve(shape, itemsize, IMPORT_CHUNK_NBYTES)
+            blocks = _halve(source_chunks, itemsize, IMPORT_BLOCK_NBYTES)
+            cfg = cfg._replace(chunks=tuple(source_chunks), blocks=blocks)
+        return cfg
+
+
+def _import(source, source_chunks, **kwargs):
+    cfg = _source_config(source.shape, source_chunks, source.dtype.itemsize, **kwargs)
+    arr = ia.empty(source.shape, **dict(cfg.kwargs, dtype=source.dtype))
+    return fill_chunks(arr, lambda index, key: source[key])
+
+
+def _export(arr, write):
+    # Chunks are decompressed ahead with imap_chunks and written in order
+    keys = list(chunk_slices(arr.shape, arr.chunks))
+    for key, data in zip(keys, imap_chunks(arr.__getitem__, keys, arr._nthreads)):
+        write(key, data)
+
+
+def to_npy(arr, path):
+    """Write `arr` to a NumPy .npy file, one chunk at a time.
+
+    Parameters
+    ----------
+    arr : IArray
+        The array to write.
+    path : str
+        The path for the .npy file.
+
+    See Also
+    --------
+    from_npy
+    """
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=arr.dtype, shape=arr.shape)
+    _export(arr, out.__setitem__)
+    out.flush()
+    del out
+
+
+def from_npy(path, **kwargs):
+    """Read a NumPy .npy file into a new compressed array, one chunk at a time.
+
+    The file is memory mapped, so only the chunks being compressed are kept in memory.
+    `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set,
+    chunks of at most 4 MB and blocks of at most 256 KB are used.
+
+    See Also
+    --------
+    to_npy
+    """
+    source = np.load(path, mmap_mode="r")
+    return _import(source, None, **kwargs)
+
+
+def to_hdf5(arr, path, name="data", **kwargs):
+    """Write `arr` to the dataset `name` in the HDF5 file at `path`, one chunk at a time.
+
+    The dataset is created with the chunks in `arr`.  `kwargs` are passed to
+    :meth:`h5py.Group.create_dataset` (e.g. for setting a compression filter).  Requires h5py.
+
+    See Also
+    --------
+    from_hdf5
+    """
+    import h5py
+
+    kwargs.setdefault("chunks", arr.chunks)
+    with h5py.File(path, "a") as f:
+        dset = f.create_dataset(name, shape=arr.shape, dtype=arr.dtype, **kwargs)
+        _export(arr, dset.__setitem__)
+
+
+def from_hdf5(path, name="data", **kwargs):
+    """Read the dataset `name` in the HDF5 file at `path` into a new compressed array, one chunk at a time.
+
+    `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set,
+    the chunks of the dataset are used, or chunks of at most 4 MB for a contiguous dataset,
+    with blocks of at most 256 KB.  Requires h5py.
+
+    See Also
+    --------
+    to_hdf5
+    """
+    import h5py
+
+    with h5py.File(path, "r") as f:
+        dset = f[name]
+        return _import(dset, dset.chunks, **kwargs)
+
+
+def to_zarr(arr, path, **kwargs):
+    """Write `arr` to a Zarr array at `path`, one chunk at a time.
+
+    The Zarr array is created with the chunks in `arr`.  `kwargs` are passed to
+    :func:`zarr.open_array` (e.g. for setting the `compressor`).  Requires zarr.
+
+    See Also
+    --------
+    from_zarr
+    """
+    import zarr
+
+    kwargs.setdefault("chunks", arr.chunks)
+    out = zarr.open_array(path, mode="w", shape=arr.shape, dtype=arr.dtype, **kwargs)
+    _export(arr, out.__setitem__)
+
+
+def from_zarr(path, **kwargs):
+    """Read the Zarr array at `path` into a new compressed array, one chunk at a time.
+
+    `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set,
+    the chunks of the Zarr array are used, with blocks of at most 256 KB.  Requires zarr.
+
+    See Also
+    --------
+    to_zarr
+    """
+    import zarr
+
+    source = zarr.open_array(path, mode="r")
+    return _import(source, source.chunks, **kwargs)
@@ -1,15 +1,23 @@
 import caterva as cat
+from caterva.ndarray import get_caterva_start_stop
+import caterva.ndarray
 import msgpack
 import numpy as np
 from .info import InfoReporter
+from . import instrument
 import iarray_community as ia
 import os
+import ast
+import time
+import collections
+import contextlib
+import pickle
 
 
 dtype_to_meta = {
     np.dtype('float64'): 0,
     np.dtype('float32'): 1,
-    # np.dtype('float16'): 2,
+    np.dtype('float16'): 2,
     # np.dtype('float8'): 3,
     np.dtype('int64'): 10,
     np.dtype('int32'): 11,
@@ -19,25 +27,154 @@ dtype_to_meta = {
     np.dtype('uint32'): 17,
     np.dtype('uint16'): 18,
     np.dtype('uint8'): 19,
-    np.dtype('bool'): 24
+    np.dtype('bool'): 24,
+    np.dtype('complex128'): 28,
+    np.dtype('complex64'): 29,
 }
+try:
+    # NumPy does not ship a bfloat16 type; use the one from ml_dtypes when available
+    import ml_dtypes
+    dtype_to_meta[np.dtype(ml_dtypes.bfloat16)] = 4
+except ImportError:
+    pass
 meta_to_dtype = {v: k for k, v in dtype_to_meta.items()}
 
 supported_dtypes = list(dtype_to_meta.keys())
 
+# Structured dtypes have their description stored in the 'iarray_dtype' metalayer
+STRUCTURED_META = 32
+
+
+def _is_supported_field(dtype):
+    if dtype.names is None:
+        return dtype.base in dtype_to_meta
+    return all(_is_supported_field(dtype.fields[name][0]) for name in dtype.names)
+
+
+def is_supported(dtype):
+    if dtype.subdtype is not None:
+        # Subarrays are only supported as fields of structured dtypes
+        raise TypeError(f"Subarray dtype {dtype} is not supported; add {dtype.shape} to the shape instead")
+    return _is_supported_field(dtype)
+
+
+def _pack_meta(dtype):
+    s_version = 0
+    s_unused = 0
+    if dtype.names is not None:
+        descr = np.lib.format.dtype_to_descr(dtype)
+        return {"iarray": msgpack.packb([s_version, STRUCTURED_META, s_unused]),
+                "iarray_dtype": msgpack.packb(repr(descr))}
+    return {"iarray": msgpack.packb([s_version, dtype_to_meta[dtype], s_unused])}
+
+
+# The packed metalayers for every dtype (structured dtypes are added when first used)
+dtype_metalayers = {dtype: _pack_meta(dtype) for dtype in dtype_to_meta}
+
 
 def add_meta(dtype, **kwargs):
     if "meta" not in kwargs:
         kwargs["meta"] = {}
-    s_version = 0
-    s_dtype = dtype_to_meta[dtype]
-    s_unused = 0
-    s_meta = msgpack.packb([s_version, s_dtype, s_unused])
-    kwargs["meta"]["iarray"] = s_meta
+    metalayers = dtype_metalayers.get(dtype)
+    if metalayers is None:
+        metalayers = dtype_metalayers[dtype] = _pack_meta(dtype)
+    kwargs["meta"].update(metalayers)
     return kwargs
 
 
-class IArray(cat.NDArray):
+def get_meta_dtype(meta):
+    _, s_dtype, _ = msgpack.unpackb(meta["iarray"])
+    if s_dtype == STRUCTURED_META:
+        descr = ast.literal_eval(msgpack.unpackb(meta["iarray_dtype"]))
+        return np.lib.format.descr_to_dtype(descr)
+    return meta_to_dtype[s_dtype]
+
+
+def _is_index(k):
+    return isinstance(k, (int, np.integer)) and not isinstance(k, (bool, np.bool_))
+
+
+def process_key(key, shape):
+    """Return the tuple of slices for `key` in an array with `shape`, and the mask of the integer indices.
+
+    This is the same as ``caterva.ndarray.process_key``, with a fast path for the usual keys
+    (integers, slices without a step and Ellipsis).
+    """
+    key = key if isinstance(key, tuple) else (key,)
+    ellipsis = [i for i, k in enumerate(key) if k is Ellipsis]
+    if len(ellipsis) > 1 or not all(_is_index(k) or k is Ellipsis or (isinstance(k, slice) and k.step in (None, 1))
+                                    for k in key):
+        return caterva.ndarray.process_key(key, shape)
+    if ellipsis:
+        i = ellipsis[0]
+        key = key[:i] + (slice(None),) * (len(shape) - len(key) + 1) + key[i + 1:]
+    if len(key) > len(shape):
+        return caterva.ndarray.process_key(key, shape)
+    key = key + (slice(None),) * (len(shape) - len(key))
+    slices = []
+    mask = []
+    for k, n in zip(key, shape):
+        if isinstance(k, slice):
+            start, stop, _ = k.indices(n)
+            slices.append(slice(start, stop, 1) if start < stop else slice(0, 0, 1))
+            mask.append(False)
+        else:
+            k = int(k) + n if k < 0 else int(k)
+            if not 0 <= k < n:
+                raise IndexError(f"index {k} is out of bounds for axis with size {n}")
+            slices.append(slice(k, k + 1, None))
+            mask.append(True)
+    return tuple(slices), tuple(mask)
+
+
+def chunk_slices(shape, chunks, offset=None):
+    """Iterate over the tuples of slices for the chunks covering an array with `shape`.
+
+    If `offset` is given, `shape` is a region starting at `offset` inside a larger array, and the
+    slices (relative to the region) are cut at the chunk boundaries of the larger array.
+    """
+    if offset is None:
+        offset = (0,) * len(shape)
+    nchunks = [(o + s - 1) // c - o // c + 1 if s > 0 else 0 for o, s, c in zip(offset, shape, chunks)]
+    for index in np.ndindex(*nchunks):
+        yield tuple(slice(max((o // c + i) * c - o, 0), min((o // c + i + 1) * c - o, s))
+                    for i, o, c, s in zip(index, offset, chunks, shape))
+
+
+def imap_chunks(func, keys, nthreads):
+    """Yield the results of `func` for every key in `keys` (in order), using `nthreads` threads.
+
+    Only a few results per thread are computed ahead, so memory stays bounded when the results
+    are consumed as they come.  Note that caterva holds the GIL while it decompresses and
+    compresses chunks, so several threads only overlap the work releasing it (like NumPy
+    operations on large chunks); `nthreads` is 1 by default, and then `func` runs in the
+    calling thread.
+    """
+    if nthreads <= 1:
+        for key in keys:
+            yield func(key)
+        return
+    # Imported here, as it is slow to import and only needed with several threads
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(nthreads) as executor:
+        pending = collections.deque()
+        for key in keys:
+            pending.append(executor.submit(func, key))
+            if len(pending) >= 2 * nthreads:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def map_chunks(func, keys, nthreads):
+    """Return the results of `func` for every key in `keys` (in order), using `nthreads` threads."""
+    return list(imap_chunks(func, keys, nthreads))
+
+
+class IArray(cat.NDArray, np.lib.mixins.NDArrayOperatorsMixin):
+    # The active WriteBuffer in batch_writes()
+    _write_buffer = None
+
     def __init__(self, **kwargs):
         self.pre_init(**kwargs)
         self._cfg = ia.Config(**kwargs)
@@ -45,7 +182,7 @@ class IArray(cat.NDArray):
 
     def pre_init(self, **kwargs):
         dtype = np.dtype(kwargs["dtype"])
-        if dtype not in dtype_to_meta:
+        if not is_supported(dtype):
             raise AttributeError("dtype is not supported")
         self._dtype = dtype
 
@@ -57,9 +194,7 @@ class IArray(cat.NDArray):
     def cast(cls, cont):
         cont.__class__ = cls
         assert isinstance(cont, IArray)
-        iarray_meta = cont.meta["iarray"]
-        _, s_dtype, _ = msgpack.unpackb(iarray_meta)
-        cont._dtype = meta_to_dtype[s_dtype]
+        cont._dtype = get_meta_dtype(cont.meta)
 
         return cont
 
@@ -77,6 +212,13 @@ class IArray(cat.NDArray):
         """
         return self[:]
 
+    @property
+    def view(self):
+        """
+        Get lazy views of this array with ``arr.view[key]``.  See :class:`IArrayView`.
+        """
+        return ia.views.ViewIndexer(ia.views.IArrayView(self))
+
     @property
     def info(self):
         """
@@ -84,6 +226,19 @@ class IArray(cat.NDArray):
         """
         return InfoReporter(self)
 
+    @property
+    def info_extended(self):
+        """
+        Print information about this array, along with a summary of :meth:`chunk_info` for a
+        sample of (at most ``info.INFO_EXTENDED_SAMPLE``) chunks.
+        """
+        return InfoReporter(self, extended=True)
+
+    @property
+    def _nthreads(self):
+        cfg = getattr(self, "_cfg", None)
+        return cfg.nthreads if cfg is not None else ia.config_params.get_config_defaults().nthreads
+
     @property
     def info_items(self):
         items = []
@@ -95,18 +250,224 @@ class IArray(cat.NDArray):
         items += [("cratio", f"{self.cratio:.2f}")]
         return items
 
+    def _chunk_keys(self):
+        return chunk_slices(self.shape, self.chunks)
+
+    @contextlib.contextmanager
+    def batch_writes(self, max_mem=2**28):
+        """Buffer the writes to this array, in a `with` block.
+
+        Inside the block, the chunks being written are kept decompressed, so many small writes
+        to the same chunk only patch the buffer; every chunk is compressed and written to the
+        array once, when the block exits or when the buffered chunks take more than `max_mem`
+        (the least recently used are written first).  Reads from the array inside the block
+        write back the buffered chunks that they overlap first.  Chunks are written back one
+        at a time in the calling thread, each one compressed with the `nthreads` of the array
+        (1 by default).
+
+        Parameters
+        ----------
+        max_mem : int
+            The approximate maximum of memory (in bytes) for the buffered chunks.  Default is
+            256 MB.
+
+        Examples
+        --------
+        >>> with arr.batch_writes(max_mem=2**26):
+        ...     for i in range(arr.shape[0]):
+        ...         arr[i, 10:20] = i
+        """
+        if self._write_buffer is not None:
+            raise ValueError("Writes to this array are already being batched")
+        self._write_buffer = ia.buffers.WriteBuffer(self, max_mem)
+        try:
+            yield self
+        finally:
+            t0 = time.perf_counter()
+            buffer, self._write_buffer = self._write_buffer, None
+            buffer.flush()
+            instrument.emit("flush", self, t0)
+
+    def _flush_writes(self, start=None, stop=None):
+        if self._write_buffer is not None:
+            self._write_buffer.flush(start, stop)
+
+    def chunk_info(self, sample=None):
+        """Return a per-chunk report of the compression for this array.
+
+        This is a full pass over the data: every chunk is decompressed and compressed again
+        (with the codec, level and filters of the array) for getting its compressed size, which
+        hence can differ slightly from the actual size in the store.  Use `sample` for only
+        analyzing some of the chunks.
+
+        Parameters
+        ----------
+        sample : int, optional
+            If given, only analyze this number of chunks, evenly spaced (in C order).
+
+        Returns
+        -------
+        np.ndarray
+            A structured array with one entry per chunk analyzed (in C order) and the fields:
+            `coords` (the chunk coordinates), `nbytes`, `cbytes`, `cratio`, `constant` (whether
+            all the values in the chunk are equal, so Blosc can likely store it as a special
+            chunk; this is a heuristic, not what was actually stored) and `codec`.
+        """
+        self._flush_writes()
+        filters = [f for f in self.filters if f.name not in ("NOFILTER", "TRUNC_PREC")]
+        codec = self.codec.name
+
+        def info(key):
+            data = cat.NDArray.__getitem__(self, key)
+            blocks = tuple(min(b, s) for b, s in zip(self.blocks, data.shape))
+            chunk = cat.asarray(data, chunks=data.shape, blocks=blocks, codec=self.codec, clevel=self.clevel,
+                                filters=filters, filtersmeta=[0] * len(filters), nthreads=1)
+            values = data.reshape(-1).view(np.uint8).reshape(-1, self.itemsize)
+            constant = bool((values == values[0]).all())
+            return data.nbytes, data.nbytes / chunk.cratio, constant
+
+        keys = list(chunk_slices(self.shape, self.chunks))
+        if sample is not None and sample < len(keys):
+            keys = [keys[i] for i in np.unique(np.linspace(0, len(keys) - 1, max(sample, 1)).round().astype(int))]
+        results = map_chunks(info, keys, self._nthreads)
+        dtype = [("coords", np.int64, (self.ndim,)), ("nbytes", np.int64), ("cbytes", np.int64),
+                 ("cratio", np.float64), ("constant", np.bool_), ("codec", "U8")]
+        out = np.empty(len(keys), dtype=dtype)
+        out["coords"] = [[k.start // c for k, c in zip(key, self.chunks)] for key in keys]
+        out["nbytes"] = [r[0] for r in results]
+        out["cbytes"] = [round(r[1]) for r in results]
+        out["cratio"] = out["nbytes"] / out["cbytes"]
+        out["constant"] = [r[2] for r in results]
+        out["codec"] = codec
+        return out
+
     def __getitem__(self, key):
-        return super(IArray, self).__getitem__(key).view(self.dtype)
+        if isinstance(key, (IArray, bool, np.bool_)) or (isinstance(key, np.ndarray) and key.dtype == np.bool_):
+            # Boolean masks select elements out-of-core
+            return ia.compress(key, self)
+        if isinstance(key, str):
+            # A field of a structured array (row storage needs to read every field)
+            return self[...][key]
+        t0 = time.perf_counter()
+        pkey, mask = process_key(key, self.shape)
+        start, stop, _ = get_caterva_start_stop(self.ndim, pkey, self.shape)
+        self._flush_writes(start, stop)
+        # Caterva removes all the dims with length 1, not only the ones indexed with an integer
+        shape = tuple(sp - st for st, sp, m in zip(start, stop, mask) if not m)
+        out = np.empty(tuple(sp - st for st, sp in zip(start, stop)), dtype=self.dtype)
+        cat.ext.get_slice_numpy(out.view(f"S{self.itemsize}"), self, (start, stop), mask)
+        out = out.reshape(shape)
+        instrument.emit("read", self, t0, key)
+        return out
+
+    def __setitem__(self, key, value):
+        t0 = time.perf_counter()
+        key, mask = process_key(key, self.shape)
+        start, stop, _ = get_caterva_start_stop(self.ndim, key, self.shape)
+        shape = tuple(sp - st for st, sp in zip(start, stop))
+        squeezed = tuple(s for s, m in zip(shape, mask) if not m)
+        # Caterva copies raw bytes, so make sure that value has the expected dtype and shape
+        value = np.broadcast_to(np.asarray(value, dtype=self.dtype), squeezed).reshape(shape)
+        if self._write_buffer is not None:
+            hits = self._write_buffer.write(start, stop, value)
+            instrument.emit("write", self, t0, key, cache_hits=hits)
+            return
+        cat.ext.set_slice(self, (start, stop), np.ascontiguousarray(value))
+        instrument.emit("write", self, t0, key)
 
     def slice(self, key, **kwargs):
+        t0 = time.perf_counter()
+        self._flush_writes()
         kwargs = add_meta(self.dtype, **kwargs)
         arr = super(IArray, self).slice(key, **kwargs)
-        return self.cast(arr)
+        arr = self.cast(arr)
+        instrument.emit("slice", arr, t0)
+        return arr
 
     def copy(self, **kwargs):
         return ia.copy(self, **kwargs)
 
+    def to_cframe(self):
+        """Return the array serialized as a contiguous frame, with its data still compressed.
+
+        The compressed chunks are copied as-is (no recompression) into the frame.  Use
+        :func:`from_cframe` for getting the array back.  The frame is built in a file in a
+        temporary directory and then read into memory, since caterva has no in-memory frames,
+        so this costs a write and a read of the compressed data on disk.  This is also how
+        arrays are pickled.
+
+        Returns
+        -------
+        bytes
+            The frame, in the same format as a contiguous ``.iarray`` file.
+        """
+        import tempfile
+
+        self._flush_writes()
+        kwargs = add_meta(self.dtype, chunks=self.chunks, blocks=self.blocks, codec=self.codec,
+                          clevel=self.clevel, usedict=False, nthreads=self._nthreads, filters=self.filters,
+                          filtersmeta=[0] * len(self.filters), contiguous=True)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            urlpath = os.path.join(tmpdir, "frame.iarray")
+            frame = cat.NDArray(**dict(kwargs, urlpath=urlpath))
+            cat.ext.copy(frame, self, **dict(kwargs, urlpath=urlpath))
+            del frame
+            with open(urlpath, "rb") as f:
+                return f.read()
+
+    def __reduce_ex__(self, protocol):
+        frame = self.to_cframe()
+        if protocol >= 5:
+            # The frame goes out-of-band instead of being copied into the pickle stream, but it
+            # is still built and read back through a temporary file on both ends
+            frame = pickle.PickleBuffer(frame)
+        return ia.from_cframe, (frame,)
+
+    def __matmul__(self, other):
+        return ia.matmul(self, other)
+
+    # NDArrayOperatorsMixin makes == elementwise, which would disable hashing
+    __hash__ = object.__hash__
+
+    def __bool__(self):
+        size = int(np.prod(self.shape))
+        if size == 0:
+            raise ValueError("The truth value of an empty array is ambiguous.  Use `array.size > 0` "
+                             "to check that an array is not empty.")
+        if size > 1:
+            raise ValueError("The truth value of an array with more than one element is ambiguous.  "
+                             "Use a.any() or a.all()")
+        return bool(self[...])
+
+    def __array__(self, dtype=None, copy=None):
+        out = self[...]
+        return out if dtype is None else out.astype(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        return ia.numpy_api.array_ufunc(ufunc, method, inputs, kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        return ia.numpy_api.array_function(func, types, args, kwargs)
+
+    def sum(self, axis=None):
+        return ia.numpy_api.reduce(self, "sum", axis)
+
+    def prod(self, axis=None):
+        return ia.numpy_api.reduce(self, "prod", axis)
+
+    def min(self, axis=None):
+        return ia.numpy_api.reduce(self, "min", axis)
+
+    def max(self, axis=None):
+        return ia.numpy_api.reduce(self, "max", axis)
+
+    def mean(self, axis=None):
+        return ia.numpy_api.reduce(self, "mean", axis)
+
     def resize(self, newshape):
+        t0 = time.perf_counter()
+        self._flush_writes()
         super(IArray, self).resize(newshape)
+        instrument.emit("resize", self, t0)
         return self
 
@@ -1,4 +1,12 @@
 from textwrap import TextWrapper
+import numpy as np
+
+# Characters for the text heatmap, from low to high compression ratio
+HEATMAP_CHARS = "@%#*+=-:."
+# Larger chunk grids are only summarised with the histogram
+HEATMAP_MAX_SIDE = 64
+# Number of chunks analyzed (evenly spaced) by the extended info, as analyzing them all is a full pass
+INFO_EXTENDED_SAMPLE = 256
 
 
 def info_text_report(items: list) -> str:
@@ -31,14 +39,109 @@ def info_html_report(items: list) -> str:
     return report
 
 
+def chunk_histogram(cinfo: np.ndarray, nbins: int = 10):
+    cratios = cinfo["cratio"]
+    lo, hi = cratios.min(), cratios.max()
+    if lo == hi:
+        hi = lo + 1
+    return np.histogram(cratios, bins=nbins, range=(lo, hi))
+
+
+def chunk_heatmap(cinfo: np.ndarray):
+    """Return the cratio for every chunk in the grid of the first two dims (the minimum over the rest)."""
+    coords = cinfo["coords"]
+    if coords.shape[1] == 0:
+        return None
+    if coords.shape[1] == 1:
+        coords = np.concatenate([np.zeros_like(coords), coords], axis=1)
+    grid = coords[:, :2].max(axis=0) + 1
+    if (grid > HEATMAP_MAX_SIDE).any():
+        return None
+    heatmap = np.full(grid, np.inf)
+    np.minimum.at(heatmap, (coords[:, 0], coords[:, 1]), cinfo["cratio"])
+    if np.isinf(heatmap).any():
+        # Only some chunks were analyzed
+        return None
+    return heatmap
+
+
+def _heat_levels(heatmap: np.ndarray):
+    lo, hi = heatmap.min(), heatmap.max()
+    if lo == hi:
+        return np.zeros(heatmap.shape, dtype=int)
+    levels = (heatmap - lo) / (hi - lo) * (len(HEATMAP_CHARS) - 1)
+    return np.rint(levels).astype(int)
+
+
+def info_chunks_text_report(cinfo: np.ndarray, nchunks: int) -> str:
+    report = ""
+    if len(cinfo) < nchunks:
+        report += f"sampled chunks : {len(cinfo)} of {nchunks} (use chunk_info() for all)\n"
+    report += f"constant chunks: {int(cinfo['constant'].sum())} of {len(cinfo)}\n"
+    worst = cinfo[np.argmin(cinfo["cratio"])]
+    coords = tuple(int(c) for c in worst["coords"])
+    report += f"worst chunk    : {coords} (cratio {worst['cratio']:.2f})\n"
+    report += "cratio histogram:\n"
+    counts, edges = chunk_histogram(cinfo)
+    for count, lo, hi in zip(counts, edges[:-1], edges[1:]):
+        bar = "#" * int(round(40 * count / counts.max()))
+        report += f"  [{lo:8.2f}, {hi:8.2f}) {count:6d} {bar}\n"
+    heatmap = chunk_heatmap(cinfo)
+    if heatmap is not None:
+        report += f"cratio heatmap ('{HEATMAP_CHARS[0]}' lowest, '{HEATMAP_CHARS[-1]}' highest):\n"
+        for row in _heat_levels(heatmap):
+            report += "  " + "".join(HEATMAP_CHARS[level] for level in row) + "\n"
+    return report
+
+
+def info_chunks_html_report(cinfo: np.ndarray) -> str:
+    report = '<table class="iarray-info-chunks">'
+    report += "<tbody>"
+    counts, edges = chunk_histogram(cinfo)
+    for count, lo, hi in zip(counts, edges[:-1], edges[1:]):
+        width = int(round(200 * count / counts.max()))
+        report += (
+            "<tr>"
+            '<th style="text-align: left">[%.2f, %.2f)</th>'
+            '<td style="text-align: right">%d</td>'
+            '<td style="text-align: left"><div style="background: steelblue; width: %dpx">&nbsp;</div></td>'
+            "</tr>" % (lo, hi, count, width)
+        )
+    report += "</tbody>"
+    report += "</table>"
+    heatmap = chunk_heatmap(cinfo)
+    if heatmap is not None:
+        levels = _heat_levels(heatmap) / (len(HEATMAP_CHARS) - 1)
+        report += '<table class="iarray-info-heatmap" style="border-collapse: collapse">'
+        report += "<tbody>"
+        for row, lrow in zip(heatmap, levels):
+            report += "<tr>"
+            for cratio, level in zip(row, lrow):
+                # Red for the lowest compression ratios, green for the highest
+                color = "rgb(%d, %d, 0)" % (255 * (1 - level), 255 * level)
+                report += '<td title="%.2f" style="background: %s; width: 8px; height: 8px"></td>' % (cratio, color)
+            report += "</tr>"
+        report += "</tbody>"
+        report += "</table>"
+    return report
+
+
 class InfoReporter(object):
-    def __init__(self, obj):
+    def __init__(self, obj, extended=False):
         self.obj = obj
+        self.extended = extended
 
     def __repr__(self):
         items = self.obj.info_items
-        return info_text_report(items)
+        report = info_text_report(items)
+        if self.extended:
+            cinfo = self.obj.chunk_info(sample=INFO_EXTENDED_SAMPLE)
+            report += info_chunks_text_report(cinfo, self.obj.nchunks)
+        return report
 
     def _repr_html_(self):
         items = self.obj.info_items
-        return info_html_report(items)
+        report = info_html_report(items)
+        if self.extended:
+            report += info_chunks_html_report(self.obj.chunk_info(sample=INFO_EXTENDED_SAMPLE))
+        return report
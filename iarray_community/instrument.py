@@ -0,0 +1,213 @@
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+from caterva.ndarray import process_key, get_caterva_start_stop
+
+
+@dataclass
+class Event:
+    """An operation done on an ironArray array, as sent to the listeners.
+
+    Parameters
+    ----------
+    op : str
+        The operation.  One of "create", "open", "read", "write", "slice", "copy", "resize" or
+        "flush" (writing back the chunks buffered by :meth:`IArray.batch_writes`).
+    wall_time : float
+        The elapsed time for the operation (in seconds).
+    nbytes : int
+        The uncompressed bytes involved in the operation.
+    cbytes : int
+        The compressed bytes involved in the operation.  For partial reads and writes this
+        is estimated from the compression ratio of the array.
+    nchunks : int
+        The number of chunks touched by the operation.
+    nthreads : int
+        The number of threads used by the operation.
+    cache_hits : int
+        The number of chunks that were served from a cache instead of the store.
+    shape : tuple
+        The shape of the array.
+    urlpath : str
+        The urlpath of the array, or None for in-memory arrays.
+    site : str
+        The ``file:line`` in user code where the operation was called from.
+    """
+    op: str
+    wall_time: float
+    nbytes: int = 0
+    cbytes: int = 0
+    nchunks: int = 0
+    nthreads: int = 1
+    cache_hits: int = 0
+    shape: Tuple = None
+    urlpath: str = None
+    site: str = None
+
+
+_listeners = []
+
+
+def add_listener(callback):
+    """Register `callback` to be called with an :class:`Event` after every operation.
+
+    Parameters
+    ----------
+    callback : callable
+        A function accepting an :class:`Event` as its only argument.
+
+    See Also
+    --------
+    remove_listener
+    Aggregator
+    """
+    _listeners.append(callback)
+
+
+def remove_listener(callback):
+    """Stop sending events to `callback`.
+
+    See Also
+    --------
+    add_listener
+    """
+    _listeners.remove(callback)
+
+
+def _call_site():
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals.get("__name__", "").split(".")[0] == __package__:
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+
+def _nchunks(start, stop, chunks):
+    nchunks = 1
+    for st, sp, c in zip(start, stop, chunks):
+        if sp <= st:
+            return 0
+        nchunks *= (sp - 1) // c - st // c + 1
+    return nchunks
+
+
+def emit(op, arr, t0, key=None, cache_hits=0):
+    """Send an event for `op` done on `arr` since `t0` (as given by :func:`time.perf_counter`)."""
+    if not _listeners:
+        return
+    wall_time = time.perf_counter() - t0
+    cratio = arr.cratio if arr.cratio > 0 else 1
+    if key is None:
+        nbytes = arr.size
+        nchunks = arr.nchunks
+    else:
+        key, _ = process_key(key, arr.shape)
+        start, stop, size = get_caterva_start_stop(arr.ndim, key, arr.shape)
+        nbytes = size * arr.itemsize
+        nchunks = _nchunks(start, stop, arr.chunks)
+    cfg = getattr(arr, "_cfg", None)
+    event = Event(
+        op=op,
+        wall_time=wall_time,
+        nbytes=nbytes,
+        cbytes=int(nbytes / cratio),
+        nchunks=nchunks,
+        nthreads=cfg.nthreads if cfg is not None else 1,
+        cache_hits=cache_hits,
+        shape=arr.shape,
+        urlpath=cfg.urlpath if cfg is not None else None,
+        site=_call_site(),
+    )
+    for callback in list(_listeners):
+        callback(event)
+
+
+@dataclass
+class OpStats:
+    """Accumulated statistics for an operation called from a site."""
+    calls: int = 0
+    wall_time: float = 0.
+    max_wall_time: float = 0.
+    nbytes: int = 0
+    cbytes: int = 0
+    nchunks: int = 0
+    cache_hits: int = 0
+
+
+class Aggregator(object):
+    """A listener accumulating the events per operation and call site.
+
+    Register it with :func:`add_listener` and use :meth:`slowest` or :meth:`to_prometheus`
+    to find out where the time goes.
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        with self._lock:
+            stats = self.stats.setdefault((event.op, event.site), OpStats())
+            stats.calls += 1
+            stats.wall_time += event.wall_time
+            stats.max_wall_time = max(stats.max_wall_time, event.wall_time)
+            stats.nbytes += event.nbytes
+            stats.cbytes += event.cbytes
+            stats.nchunks += event.nchunks
+            stats.cache_hits += event.cache_hits
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+    def slowest(self, n=10):
+        """Return the `n` (op, site) pairs with the largest accumulated time, along with their stats."""
+        items = sorted(self.stats.items(), key=lambda item: item[1].wall_time, reverse=True)
+        return items[:n]
+
+    def to_prometheus(self, prefix="iarray"):
+        """Export the accumulated statistics in the Prometheus text exposition format."""
+        return to_prometheus(self, prefix)
+
+
+_metrics = [
+    ("calls", "counter", "Number of operations"),
+    ("wall_time", "counter", "Seconds spent in operations"),
+    ("max_wall_time", "gauge", "Maximum seconds spent in a single operation"),
+    ("nbytes", "counter", "Uncompressed bytes involved in operations"),
+    ("cbytes", "counter", "Compressed bytes involved in operations"),
+    ("nchunks", "counter", "Chunks touched by operations"),
+    ("cache_hits", "counter", "Chunks served from a cache"),
+]
+
+
+def to_prometheus(aggregator, prefix="iarray"):
+    """Export the statistics in `aggregator` in the Prometheus text exposition format.
+
+    Parameters
+    ----------
+    aggregator : :class:`Aggregator`
+        The aggregator with the statistics.
+    prefix : str
+        The prefix for the metric names.
+
+    Returns
+    -------
+    str
+        The metrics, ready to be served to a Prometheus scraper.
+    """
+    with aggregator._lock:
+        stats = dict(aggregator.stats)
+    lines = []
+    for name, kind, doc in _metrics:
+        metric = f"{prefix}_{name}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# HELP {metric} {doc}.")
+        lines.append(f"# TYPE {metric} {kind}")
+        for (op, site), s in stats.items():
+            site = (site or "").replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{metric}{{op="{op}",site="{site}"}} {getattr(s, name)}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,93 @@
+import numpy as np
+import iarray_community as ia
+from .iarray import chunk_slices, imap_chunks
+
+
+def matmul(a, b, max_mem=2**28, **kwargs):
+    """Matrix product of two 2-dim arrays.
+
+    The product is computed one output chunk (tile) at a time, accumulating the products of the
+    tiles of `a` and `b` along the shared dimension with NumPy (and hence BLAS).  The tiles along
+    the shared dimension follow the chunks of `b`, so fetches are chunk-aligned.  The column
+    panels of `b` are kept and reused for all the rows of output tiles when `b` fits in
+    `max_mem`, and the tiles of `a` for a row of output tiles are kept and reused for all the
+    output tiles in that row when they fit too.  Output tiles are computed with `nthreads`
+    threads, as long as their working sets fit in `max_mem`; tiles are made smaller
+    along the shared dimension when needed, and a ValueError is raised when the output chunks
+    themselves do not fit.
+
+    `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set,
+    the rows of the chunks (blocks) in `a` and the columns of the chunks (blocks) in `b` are used.
+
+    Parameters
+    ----------
+    a : IArray
+        The first operand, with shape (M, K).
+    b : IArray
+        The second operand, with shape (K, N).
+    max_mem : int
+        The approximate maximum of memory (in bytes) to be used for the computation.  Default is
+        256 MB.
+
+    Returns
+    -------
+    IArray
+        The (M, N) product.
+    """
+    if a.ndim != 2 or b.ndim != 2:
+        raise ValueError("matmul only supports 2-dim arrays")
+    if a.shape[1] != b.shape[0]:
+        raise ValueError(f"Shapes {a.shape} and {b.shape} are not aligned")
+    m, k = a.shape
+    n = b.shape[1]
+    dtype = np.result_type(a.dtype, b.dtype)
+
+    with ia.config(**kwargs) as cfg:
+        if cfg.chunks is None and cfg.blocks is None:
+            cfg = cfg._replace(chunks=(a.chunks[0], b.chunks[1]), blocks=(a.blocks[0], b.blocks[1]))
+        out = ia.empty((m, n), **dict(cfg.kwargs, dtype=dtype))
+
+    tm, tn = out.chunks
+    itemsize = dtype.itemsize
+    # The k tiles follow the chunks of b (split when needed to fit in max_mem), so fetches
+    # from b are chunk-aligned.  Working set for computing one output tile: a tile from a
+    # and b, and the accumulator.
+    tk = b.chunks[0]
+    while tk > 1 and ((tm + tn) * tk + tm * tn) * itemsize > max_mem:
+        tk = (tk + 1) // 2
+    tile_mem = ((tm + tn) * tk + tm * tn) * itemsize
+    if tile_mem > max_mem:
+        raise ValueError(f"Output chunks {(tm, tn)} are too large for max_mem={max_mem}")
+    nthreads = max(min(out._nthreads, max_mem // tile_mem), 1)
+    free = max_mem - nthreads * tile_mem
+    k_keys = [slice(start, min(start + tk, key[0].stop))
+              for key in chunk_slices((k,), b.chunks[:1]) for start in range(key[0].start, key[0].stop, tk)]
+    cols = [key[0] for key in chunk_slices((n,), (tn,))]
+
+    # The column panels of b are shared by all the rows of output tiles when b fits in memory
+    b_panels = None
+    if k * n * itemsize <= free:
+        free -= k * n * itemsize
+        b_panels = {col.start: b[:, col] for col in cols}
+    # The tiles of a for a row of output tiles are reused when they fit in the remaining memory
+    reuse_panel = tm * k * itemsize <= free
+
+    for row in chunk_slices((m,), (tm,)):
+        row = row[0]
+        panel = a[row, :] if reuse_panel else None
+
+        def tile(col, row=row, panel=panel):
+            if panel is not None and b_panels is not None:
+                # Both operands are in memory, so a single product does it
+                return panel @ b_panels[col.start]
+            acc = np.zeros((row.stop - row.start, col.stop - col.start), dtype=dtype)
+            for kk in k_keys:
+                a_tile = a[row, kk] if panel is None else panel[:, kk]
+                b_tile = b[kk, col] if b_panels is None else b_panels[col.start][kk]
+                acc += a_tile @ b_tile
+            return acc
+
+        for col, acc in zip(cols, imap_chunks(tile, cols, nthreads)):
+            out[row, col] = acc
+
+    return out
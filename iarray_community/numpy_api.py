@@ -0,0 +1,186 @@
+import numpy as np
+import iarray_community as ia
+from .constructors import fill_chunks
+from . import reductions
+
+
+# Reductions of the ufuncs with a chunked implementation
+_ufunc_reductions = {
+    np.add: "sum",
+    np.multiply: "prod",
+    np.minimum: "min",
+    np.maximum: "max",
+}
+
+
+def _to_numpy(obj):
+    if isinstance(obj, ia.IArray):
+        return obj[...]
+    if isinstance(obj, ia.IArrayView):
+        return obj.data
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_to_numpy(o) for o in obj)
+    if isinstance(obj, dict):
+        return {k: _to_numpy(v) for k, v in obj.items()}
+    return obj
+
+
+def _has_iarray(obj):
+    if isinstance(obj, (ia.IArray, ia.IArrayView)):
+        return True
+    if isinstance(obj, (list, tuple)):
+        return any(_has_iarray(o) for o in obj)
+    return False
+
+
+def _sample(obj):
+    if isinstance(obj, (ia.IArray, ia.IArrayView, np.ndarray)):
+        return np.zeros(1, dtype=obj.dtype)
+    return obj
+
+
+def elementwise(func, inputs, dtype=None, out=None, **kwargs):
+    """Apply `func` to the `inputs` chunk by chunk, returning a new compressed array.
+
+    `inputs` can be ironArray arrays or views (all with the same shape), NumPy arrays
+    broadcastable to that shape, or scalars.  If `out` is given, the results are written
+    into it (it can be one of the `inputs`) and it is returned.  Else, `kwargs` are the same
+    than for :func:`empty`, and if neither `chunks` nor `blocks` are set, the ones in the
+    first ironArray array in `inputs` are used.  At least one of the `inputs` or `out` must be
+    an ironArray array.
+    """
+    operands = list(inputs) + ([out] if out is not None else [])
+    ref = next(i for i in operands if isinstance(i, ia.IArray))
+    shape = ref.shape
+    for i in operands:
+        if isinstance(i, (ia.IArray, ia.IArrayView)) and i.shape != shape:
+            raise ValueError(f"Operands with shapes {shape} and {i.shape} are not supported together")
+    args = [np.broadcast_to(i, shape) if isinstance(i, np.ndarray) else i for i in inputs]
+    if out is None:
+        if dtype is None:
+            with np.errstate(all="ignore"):
+                dtype = np.asarray(func(*[_sample(i) for i in inputs])).dtype
+        with ia.config(**kwargs) as cfg:
+            if cfg.chunks is None and cfg.blocks is None:
+                cfg = cfg._replace(chunks=ref.chunks, blocks=ref.blocks)
+            out = ia.empty(shape, **dict(cfg.kwargs, dtype=dtype))
+
+    def chunk(index, key):
+        # Every chunk of out only depends on the same region of the inputs, so out can be an input too
+        return func(*[a[key] if isinstance(a, (ia.IArray, ia.IArrayView, np.ndarray)) else a for a in args])
+
+    return fill_chunks(out, chunk)
+
+
+def reduce(a, name, axis=None):
+    """Reduce `a` chunk by chunk, returning a scalar (for `axis` None) or a new compressed array."""
+    out = reductions.reduce(a, name, axis)
+    if axis is None or out.ndim == 0:
+        return out[()]
+    if axis < 0:
+        axis += a.ndim
+    with ia.config() as cfg:
+        if cfg.chunks is None and cfg.blocks is None:
+            cfg = cfg._replace(chunks=a.chunks[:axis] + a.chunks[axis + 1:],
+                               blocks=a.blocks[:axis] + a.blocks[axis + 1:])
+        return ia.numpy2iarray(out, **cfg.kwargs)
+
+
+def array_ufunc(ufunc, method, inputs, kwargs):
+    out = kwargs.get("out")
+    if out is not None and _has_iarray(out):
+        out = out[0] if isinstance(out, tuple) and len(out) == 1 else out
+        if (method != "__call__" or ufunc.nout != 1 or ufunc.signature is not None or "where" in kwargs
+                or not isinstance(out, ia.IArray)):
+            raise TypeError(f"out= with ironArray arrays is only supported for elementwise ufuncs "
+                            f"with a single output, not for {ufunc.__name__}.{method}")
+        kw = {k: v for k, v in kwargs.items() if k != "out"}
+
+        def func(*args):
+            # Computing into an array of the out dtype keeps the casting rules of NumPy
+            result = np.empty(np.broadcast(*args).shape, dtype=out.dtype)
+            return ufunc(*args, out=result, **kw)
+
+        return elementwise(func, inputs, out=out)
+    if out is None:
+        kwargs.pop("out", None)
+        if ufunc is np.matmul and method == "__call__" and not kwargs:
+            a, b = inputs
+            if isinstance(a, ia.IArray) and isinstance(b, ia.IArray):
+                return ia.matmul(a, b)
+        elif method == "__call__" and ufunc.nout == 1 and ufunc.signature is None and "where" not in kwargs:
+            return elementwise(lambda *args: ufunc(*args, **kwargs), inputs)
+        elif method == "reduce" and ufunc in _ufunc_reductions and len(inputs) == 1:
+            axis = kwargs.pop("axis", 0)
+            if not kwargs and (axis is None or isinstance(axis, int)):
+                return reduce(inputs[0], _ufunc_reductions[ufunc], axis)
+    # Fall back to NumPy for everything else
+    return getattr(ufunc, method)(*_to_numpy(inputs), **_to_numpy(kwargs))
+
+
+def _reduction(name):
+    def impl(a, axis=None, dtype=None, out=None, keepdims=False, **kwargs):
+        if dtype is not None or out is not None or keepdims or kwargs or not (axis is None or isinstance(axis, int)):
+            return NotImplemented
+        return reduce(a, name, axis)
+    return impl
+
+
+def _where(condition, x=None, y=None):
+    if x is None or y is None:
+        return NotImplemented
+    return elementwise(np.where, [condition, x, y])
+
+
+def _clip(a, a_min=None, a_max=None, out=None, **kwargs):
+    if out is not None or kwargs:
+        return NotImplemented
+    return elementwise(lambda x: np.clip(x, a_min, a_max), [a])
+
+
+def _concatenate(arrays, axis=0, out=None, **kwargs):
+    if out is not None or kwargs or axis is None or not all(isinstance(a, ia.IArray) for a in arrays):
+        return NotImplemented
+    return ia.concatenate(arrays, axis)
+
+
+def _stack(arrays, axis=0, out=None, **kwargs):
+    if out is not None or kwargs or not all(isinstance(a, ia.IArray) for a in arrays):
+        return NotImplemented
+    return ia.stack(arrays, axis)
+
+
+def _dot(a, b, out=None):
+    if out is not None or not (isinstance(a, ia.IArray) and isinstance(b, ia.IArray)):
+        return NotImplemented
+    return ia.matmul(a, b)
+
+
+# NumPy functions with a chunked implementation
+HANDLED_FUNCTIONS = {
+    np.sum: _reduction("sum"),
+    np.prod: _reduction("prod"),
+    np.min: _reduction("min"),
+    np.max: _reduction("max"),
+    np.amin: _reduction("min"),
+    np.amax: _reduction("max"),
+    np.mean: _reduction("mean"),
+    np.where: _where,
+    np.clip: _clip,
+    np.concatenate: _concatenate,
+    np.stack: _stack,
+    np.dot: _dot,
+}
+
+
+def array_function(func, types, args, kwargs):
+    impl = HANDLED_FUNCTIONS.get(func)
+    if impl is not None:
+        result = impl(*args, **kwargs)
+        if result is not NotImplemented:
+            return result
+    if _has_iarray(kwargs.get("out")):
+        # NumPy would write into a temporary copy, leaving out unchanged
+        raise TypeError(f"out= with ironArray arrays is not supported for {func.__name__}")
+    # Fall back to NumPy for everything else
+    return func(*_to_numpy(args), **_to_numpy(kwargs))
@@ -0,0 +1,88 @@
+import numpy as np
+from .constructors import empty, fill_chunks
+
+
+def _random(shape, seed, sample, **kwargs):
+    arr = empty(shape, **kwargs)
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    def chunk(index, key):
+        # Every chunk gets its own stream, so the result does not depend on the number of threads
+        rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=(index,))))
+        return sample(rng, tuple(k.stop - k.start for k in key))
+
+    return fill_chunks(arr, chunk)
+
+
+def uniform(shape, low=0., high=1., seed=None, **kwargs):
+    """Return an array with random samples from a uniform distribution over ``[low, high)``.
+
+    Each chunk is generated on its own from an independent random stream derived from `seed`
+    and the chunk position, so the result only depends on `seed` and the chunk shape.
+
+    Parameters
+    ----------
+    shape : tuple, list
+        The shape of the array to be created.
+    low : float
+        The lower boundary of the output interval.  Default is 0.
+    high : float
+        The upper boundary of the output interval.  Default is 1.
+    seed : int
+        The seed for the random streams.  If None (the default), a fresh seed is used.
+    kwargs : dict
+        A dictionary for setting some or all of the fields in the Config
+        dataclass that should override the current configuration.
+
+    Returns
+    -------
+    IArray
+        The new array.
+    """
+    return _random(shape, seed, lambda rng, size: rng.uniform(low, high, size), **kwargs)
+
+
+def normal(shape, loc=0., scale=1., seed=None, **kwargs):
+    """Return an array with random samples from a normal (Gaussian) distribution.
+
+    `shape`, `seed` and `kwargs` are the same than for :func:`uniform`.
+
+    Parameters
+    ----------
+    loc : float
+        The mean of the distribution.  Default is 0.
+    scale : float
+        The standard deviation of the distribution.  Default is 1.
+
+    Returns
+    -------
+    IArray
+        The new array.
+    """
+    return _random(shape, seed, lambda rng, size: rng.normal(loc, scale, size), **kwargs)
+
+
+def randint(shape, low, high=None, seed=None, **kwargs):
+    """Return an array with random integers from ``[low, high)``.
+
+    `shape`, `seed` and `kwargs` are the same than for :func:`uniform`.
+
+    Parameters
+    ----------
+    low : int
+        The lowest integer to be drawn.  If `high` is None, integers are drawn from ``[0, low)``.
+    high : int
+        One above the largest integer to be drawn.
+
+    The array has the `dtype` in the configuration, so pass an integer `dtype` for getting
+    an integer array.
+
+    Returns
+    -------
+    IArray
+        The new array.
+    """
+    if high is None:
+        low, high = 0, low
+    return _random(shape, seed, lambda rng, size: rng.integers(low, high, size), **kwargs)
@@ -0,0 +1,72 @@
+import numpy as np
+from .iarray import map_chunks
+
+
+# How the partial results for the chunks are combined
+_combine = {
+    "sum": np.add,
+    "prod": np.multiply,
+    "min": np.minimum,
+    "max": np.maximum,
+    "mean": np.add,
+}
+
+
+def _partial(name, data, axis, dtype):
+    if name == "mean":
+        return np.sum(data, axis=axis, dtype=dtype)
+    return getattr(np, name)(data, axis=axis)
+
+
+def reduce(obj, name, axis=None):
+    """Reduce `obj` chunk by chunk.
+
+    Parameters
+    ----------
+    obj : IArray, IArrayView
+        The array to reduce.  It needs a `_chunk_keys()` method returning the keys of the
+        chunks to read.
+    name : str
+        The reduction.  One of "sum", "prod", "min", "max" or "mean".
+    axis : int, optional
+        The axis to reduce along.  If None (the default), all the elements are reduced.
+
+    Returns
+    -------
+    np.ndarray
+        The reduced array (or a NumPy scalar when `axis` is None).
+    """
+    if name not in _combine:
+        raise ValueError(f"Unsupported reduction: {name}")
+    combine = _combine[name]
+    # Like NumPy, averages of integers are computed in float64
+    dtype = obj.dtype if obj.dtype.kind in "fc" else np.dtype(np.float64)
+    keys = list(obj._chunk_keys())
+    if axis is None:
+        partials = map_chunks(lambda key: _partial(name, obj[key], None, dtype), keys, obj._nthreads)
+        out = combine.reduce(np.array(partials))
+        if name == "mean":
+            out = out / int(np.prod(obj.shape))
+        return out
+
+    if axis < 0:
+        axis += obj.ndim
+    if not 0 <= axis < obj.ndim:
+        raise ValueError(f"axis {axis} is out of bounds for an array of dimension {obj.ndim}")
+    out_shape = obj.shape[:axis] + obj.shape[axis + 1:]
+    out = None
+    seen = set()
+    partials = map_chunks(lambda key: _partial(name, obj[key], axis, dtype), keys, obj._nthreads)
+    for key, part in zip(keys, partials):
+        out_key = key[:axis] + key[axis + 1:]
+        if out is None:
+            out = np.empty(out_shape, dtype=part.dtype)
+        region = tuple((k.start, k.stop) for k in out_key)
+        if region in seen:
+            out[out_key] = combine(out[out_key], part)
+        else:
+            out[out_key] = part
+            seen.add(region)
+    if name == "mean":
+        out = out / obj.shape[axis]
+    return out
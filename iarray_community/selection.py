@@ -0,0 +1,125 @@
+import numpy as np
+import iarray_community as ia
+from .iarray import chunk_slices, imap_chunks
+from .constructors import fill_chunks
+
+
+def compress(condition, a, max_mem=2**28, **kwargs):
+    """Return a 1-dim array with the elements in `a` where `condition` is true.
+
+    This is the same as ``a[condition]`` in NumPy for a boolean `condition` with the shape of `a`,
+    and the elements come in the same (C) order.  The selection is done on slabs of chunks along
+    the first dimension (split into smaller regions that are contiguous in C order when they do
+    not fit in `max_mem`), and the selected elements are written in order (at the offsets given
+    by the running count of the previous regions) as they come.  When `condition` is an array, the chunks of `a` where the condition is false
+    everywhere are not read at all.
+
+    As in NumPy, a boolean scalar (or 0-dim array) `condition` selects all of `a` with a new
+    first axis of length 1 when it is true, and nothing (a length of 0 in that axis) when it
+    is false.
+
+    `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set, the
+    number of elements in the chunks (blocks) of `a` is used, or the chunks (blocks) of `a` with
+    a 1 prepended for a scalar `condition`.
+
+    Parameters
+    ----------
+    condition : IArray, np.ndarray, bool or callable
+        A boolean array with the shape of `a`, a boolean scalar, or a function getting the data
+        for a region of `a` and returning the boolean mask for it (e.g. ``lambda x: x > 0``).
+    a : IArray
+        The array to select the elements from.
+    max_mem : int
+        The approximate maximum of memory (in bytes) to be used for the regions being
+        processed, besides the chunk of the output being written.  Default is 256 MB.
+
+    Returns
+    -------
+    IArray
+        The selected elements.
+    """
+    if isinstance(condition, (bool, np.bool_)) or (isinstance(condition, np.ndarray) and condition.shape == ()
+                                                   and condition.dtype == np.bool_):
+        return _compress_scalar(bool(condition), a, **kwargs)
+    if isinstance(condition, (ia.IArray, np.ndarray)):
+        if condition.shape != a.shape:
+            raise ValueError(f"condition has shape {condition.shape}, but the array has shape {a.shape}")
+        if condition.dtype != np.bool_:
+            raise ValueError("condition must be a boolean array")
+    elif not callable(condition):
+        raise TypeError("condition must be a boolean array or a callable")
+
+    with ia.config(**kwargs) as cfg:
+        if cfg.chunks is None and cfg.blocks is None:
+            cfg = cfg._replace(chunks=(int(np.prod(a.chunks)),), blocks=(int(np.prod(a.blocks)),))
+        kwargs = dict(cfg.kwargs, dtype=a.dtype)
+    out_chunk = kwargs["chunks"][0]
+
+    # Every region needs its data, mask and selected elements, and a few regions per thread
+    # are in flight
+    elem_mem = 2 * a.dtype.itemsize + 1
+    elems_fit = max(max_mem // (2 * max(a._nthreads, 1) * elem_mem), 1)
+    # Regions are whole along the last dims and split along the first one that does not fit,
+    # so they are contiguous in C order
+    batch = [1] * a.ndim
+    trailing = 1
+    for d in reversed(range(a.ndim)):
+        if d > 0 and trailing * a.shape[d] <= elems_fit:
+            batch[d] = a.shape[d]
+            trailing *= a.shape[d]
+        else:
+            batch[d] = max(min(a.chunks[d], elems_fit // trailing), 1)
+            break
+
+    def select(key):
+        if callable(condition):
+            data = a[key]
+            return data[np.broadcast_to(np.asarray(condition(data), dtype=bool), data.shape)]
+        mask = condition[key]
+        if not mask.any():
+            return np.empty(0, dtype=a.dtype)
+        # Only read the chunks with some element selected
+        start = tuple(k.start for k in key)
+        data = np.empty(mask.shape, dtype=a.dtype)
+        for ckey in chunk_slices(mask.shape, a.chunks, start):
+            if mask[ckey].any():
+                data[ckey] = a[tuple(slice(s + k.start, s + k.stop) for s, k in zip(start, ckey))]
+        return data[mask]
+
+    out = None
+    written = 0
+    pending = []
+
+    def write(end):
+        # Write the pending elements up to `end`, growing the output as needed
+        nonlocal out, written, pending
+        data = np.concatenate(pending)
+        if out is None:
+            out = ia.empty((end,), **kwargs)
+        else:
+            out.resize((end,))
+        out[written:end] = data[:end - written]
+        pending = [data[end - written:]]
+        written = end
+
+    keys = list(chunk_slices(a.shape, batch))
+    for values in imap_chunks(select, keys, a._nthreads):
+        pending.append(values)
+        # Elements are written in whole chunks of the output
+        end = (written + sum(len(p) for p in pending)) // out_chunk * out_chunk
+        if end > written:
+            write(end)
+    end = written + sum(len(p) for p in pending)
+    if end > written:
+        write(end)
+    if out is None:
+        out = ia.empty((0,), **kwargs)
+    return out
+
+
+def _compress_scalar(condition, a, **kwargs):
+    with ia.config(**kwargs) as cfg:
+        if cfg.chunks is None and cfg.blocks is None:
+            cfg = cfg._replace(chunks=(1,) + a.chunks, blocks=(1,) + a.blocks)
+        out = ia.empty((int(condition),) + a.shape, **dict(cfg.kwargs, dtype=a.dtype))
+    return fill_chunks(out, lambda index, key: a[key[1:]][np.newaxis])
@@ -0,0 +1,356 @@
+import numpy as np
+import iarray_community as ia
+from .iarray import chunk_slices, imap_chunks
+from . import reductions
+
+
+# Number of bins used for narrowing down the values in exact quantiles
+QUANTILE_BINS = 1024
+# Values are gathered and sorted in memory once the candidates for a quantile are below this
+QUANTILE_MAX_CANDIDATES = 2**20
+# Resolution of sketched quantiles: the error in the rank is bounded by about size / SKETCH_SIZE
+SKETCH_SIZE = 2048
+
+
+def histogram(a, bins=10, range=None):
+    """Compute the histogram of the values in `a`, chunk by chunk.
+
+    This works like :func:`numpy.histogram` (without `weights` and `density`).  The histograms
+    for the chunks are computed with `nthreads` threads and added together.
+
+    Parameters
+    ----------
+    a : IArray, IArrayView
+        The data.
+    bins : int or sequence of scalars
+        The number of equal-width bins or, if a sequence, the bin edges.  Default is 10.
+    range : (float, float), optional
+        The lower and upper range of the bins.  If not given, the minimum and maximum of `a`
+        (which need an additional pass over the data).
+
+    Returns
+    -------
+    hist : np.ndarray
+        The number of values in each bin.
+    bin_edges : np.ndarray
+        The bin edges (``length(hist) + 1``).
+    """
+    if range is None and np.ndim(bins) == 0:
+        range = (reductions.reduce(a, "min"), reductions.reduce(a, "max"))
+    edges = np.histogram_bin_edges(np.empty(0, dtype=a.dtype), bins, range)
+    hist = np.zeros(len(edges) - 1, dtype=np.int64)
+    keys = list(a._chunk_keys())
+    for part in imap_chunks(lambda key: np.histogram(a[key], edges)[0], keys, a._nthreads):
+        hist += part
+    return hist, edges
+
+
+def _select(a, ranks):
+    # Return the values with the given ranks (positions in the sorted, flattened data) in `a`.
+    # The interval holding each rank is narrowed down with histograms until the values in it fit
+    # in memory (or are all the same).
+    keys = list(a._chunk_keys())
+    size = int(np.prod(a.shape))
+    lo, hi = reductions.reduce(a, "min"), reductions.reduce(a, "max")
+    # (lo, hi, closed, below, gather) for every rank, where below is the number of values < lo
+    state = {r: (lo, hi, True, 0, size <= QUANTILE_MAX_CANDIDATES) for r in ranks}
+    found = {}
+    while len(found) < len(state):
+        intervals = sorted({s for r, s in state.items() if r not in found}, key=lambda s: (s[0], s[1]))
+
+        def partial(key):
+            data = a[key].reshape(-1)
+            parts = []
+            for lo, hi, closed, below, gather in intervals:
+                inside = data[(data >= lo) & ((data <= hi) if closed else (data < hi))]
+                if gather:
+                    parts.append(inside)
+                else:
+                    edges = np.linspace(lo, hi, QUANTILE_BINS + 1)
+                    vmin, vmax = (inside.min(), inside.max()) if len(inside) else (hi, lo)
+                    parts.append((np.histogram(inside, edges)[0], vmin, vmax))
+            return parts
+
+        results = list(zip(*imap_chunks(partial, keys, a._nthreads)))
+        for interval, parts in zip(intervals, results):
+            lo, hi, closed, below, gather = interval
+            if gather:
+                values = np.sort(np.concatenate(parts))
+                for r, s in state.items():
+                    if s == interval:
+                        found[r] = values[r - below]
+                continue
+            counts = np.sum([p[0] for p in parts], axis=0)
+            vmin, vmax = min(p[1] for p in parts), max(p[2] for p in parts)
+            edges = np.linspace(lo, hi, QUANTILE_BINS + 1)
+            cum = below + np.cumsum(counts)
+            for r, s in state.items():
+                if s != interval:
+                    continue
+                if vmin == vmax:
+                    found[r] = vmin
+                    continue
+                b = int(np.searchsorted(cum, r, side="right"))
+                state[r] = (edges[b], edges[b + 1], closed and b == QUANTILE_BINS - 1,
+                            int(cum[b - 1]) if b > 0 else below, counts[b] <= QUANTILE_MAX_CANDIDATES)
+    return found
+
+
+def _compact(values, weights, size):
+    # Keep `size` of the sorted `values` at evenly spaced (weighted) ranks
+    if len(values) <= size:
+        return values, weights
+    cum = np.cumsum(weights)
+    targets = (np.arange(size) + 0.5) * cum[-1] / size
+    values = values[np.minimum(np.searchsorted(cum, targets), len(values) - 1)]
+    return values, np.full(size, cum[-1] / size)
+
+
+def _sketch(data, size):
+    # A summary of `data` with at most `size` (value, weight) pairs
+    data = np.sort(data.reshape(-1))
+    return _compact(data, np.ones(len(data)), size)
+
+
+def _merge_sketches(s1, s2, size):
+    values = np.concatenate([s1[0], s2[0]])
+    weights = np.concatenate([s1[1], s2[1]])
+    # A stable sort merges the two sorted runs in linear time
+    order = np.argsort(values, kind="stable")
+    return _compact(values[order], weights[order], size)
+
+
+def quantile(a, q, method="exact"):
+    """Compute the `q`-th quantiles of all the values in `a`.
+
+    This works like :func:`numpy.quantile` (with the default "linear" interpolation) over the
+    flattened data.
+
+    With the "exact" method, the values at the required ranks are found with a few passes over
+    the data, each one computing histograms of the intervals holding them, until
+    the values in those intervals fit in memory.  With the "sketch" method, a summary of each
+    chunk (a bounded number of values with their weights) is computed in a single pass and the
+    summaries are merged pairwise in a binary tree, so the result is approximate (the error in
+    the rank is bounded by about ``a.size / SKETCH_SIZE``, no matter the number of chunks).
+
+    Parameters
+    ----------
+    a : IArray, IArrayView
+        The data.
+    q : float or sequence of floats
+        The quantiles to compute, between 0 and 1.
+    method : str
+        "exact" (the default) or "sketch".
+
+    Returns
+    -------
+    float or np.ndarray
+        The quantiles, with the shape of `q`.
+    """
+    q = np.asarray(q, dtype=np.float64)
+    if np.any((q < 0) | (q > 1)):
+        raise ValueError("Quantiles must be in the range [0, 1]")
+    if method not in ("exact", "sketch"):
+        raise ValueError(f"Unsupported method: {method}")
+    size = int(np.prod(a.shape))
+    if size == 0:
+        raise ValueError("Cannot compute quantiles of an empty array")
+    keys = list(a._chunk_keys())
+
+    if a.dtype.kind in "fc" and np.isnan(reductions.reduce(a, "max")):
+        out = np.full(q.shape, np.nan)
+    elif method == "sketch":
+        # Summaries are merged in a binary tree (levels[h] summarizes 2**h chunks), so the error
+        # only grows with the depth of the tree, which is compensated with larger summaries
+        depth = int(np.ceil(np.log2(len(keys)))) + 1
+        sketch_size = SKETCH_SIZE * depth
+
+        def partial(key):
+            data = a[key]
+            return _sketch(data, sketch_size), data.min(), data.max()
+
+        levels = []
+        vmin, vmax = None, None
+        for part, pmin, pmax in imap_chunks(partial, keys, a._nthreads):
+            h = 0
+            while h < len(levels) and levels[h] is not None:
+                part = _merge_sketches(levels[h], part, sketch_size)
+                levels[h] = None
+                h += 1
+            if h == len(levels):
+                levels.append(None)
+            levels[h] = part
+            vmin = pmin if vmin is None else min(vmin, pmin)
+            vmax = pmax if vmax is None else max(vmax, pmax)
+        summary = None
+        for part in levels:
+            if part is not None:
+                summary = part if summary is None else _merge_sketches(summary, part, sketch_size)
+        values, weights = summary
+        # The extremes are kept apart, as the summaries do not need to include them
+        ranks = np.concatenate([[0.5], np.cumsum(weights) - weights / 2, [size - 0.5]])
+        values = np.concatenate([[vmin], values, [vmax]]).astype(np.float64)
+        out = np.interp(q * (size - 1) + 0.5, ranks, values)
+    else:
+        k = q * (size - 1)
+        lower = np.floor(k).astype(np.int64)
+        upper = np.ceil(k).astype(np.int64)
+        found = _select(a, set(lower.ravel().tolist()) | set(upper.ravel().tolist()))
+        vlower = np.array([found[r] for r in lower.ravel()], dtype=np.float64).reshape(q.shape)
+        vupper = np.array([found[r] for r in upper.ravel()], dtype=np.float64).reshape(q.shape)
+        out = vlower + (vupper - vlower) * (k - lower)
+    return out[()] if out.ndim == 0 else out
+
+
+def _merge_runs(read, runs, itemsize, max_mem, write):
+    # k-way merge of the sorted runs (start, stop) through read(start, stop) -> (values, indices),
+    # writing the merged (values, indices) with write(data) in order
+    nbuf = max(max_mem // (4 * len(runs) * itemsize), 1)
+    pos = [start for start, stop in runs]
+    bufs = [None] * len(runs)
+    while True:
+        for r, (start, stop) in enumerate(runs):
+            if (bufs[r] is None or len(bufs[r][0]) == 0) and pos[r] < stop:
+                bufs[r] = read(pos[r], min(pos[r] + nbuf, stop))
+                pos[r] = min(pos[r] + nbuf, stop)
+        active = [r for r in range(len(runs)) if bufs[r] is not None and len(bufs[r][0])]
+        if not active:
+            break
+        # Only the values up to the smallest last value in the buffers of the runs with more
+        # values to read are known to be in their final order
+        pending = [bufs[r][0][-1:] for r in active if pos[r] < runs[r][1]]
+        if pending:
+            lasts = np.concatenate(pending)
+            frontier = lasts[np.argsort(lasts)[:1]]
+        parts_v, parts_i = [], []
+        for r in active:
+            n = int(np.searchsorted(bufs[r][0], frontier, side="right")[0]) if pending else len(bufs[r][0])
+            parts_v.append(bufs[r][0][:n])
+            parts_i.append(bufs[r][1][:n])
+            bufs[r] = (bufs[r][0][n:], bufs[r][1][n:])
+        values = np.concatenate(parts_v)
+        order = np.argsort(values, kind="stable")
+        write(values[order], np.concatenate(parts_i)[order])
+
+
+def _sort(a, axis, max_mem, indices, **kwargs):
+    if axis < 0:
+        axis += a.ndim
+    if not 0 <= axis < a.ndim:
+        raise ValueError(f"axis {axis} is out of bounds for an array of dimension {a.ndim}")
+    dtype = np.dtype(np.int64) if indices else a.dtype
+    with ia.config(**kwargs) as cfg:
+        if cfg.chunks is None and cfg.blocks is None:
+            cfg = cfg._replace(chunks=a.chunks, blocks=a.blocks)
+        out = ia.empty(a.shape, **dict(cfg.kwargs, dtype=dtype))
+
+    n = a.shape[axis]
+    # Sorting needs the data, the indices and a temporary copy of them
+    itemsize = 2 * (a.dtype.itemsize + (8 if indices else 0))
+    lane_mem = max(n, 1) * itemsize
+    if lane_mem <= max_mem:
+        # Lanes are sorted in batches (inside a chunk) that fit in memory
+        lanes_fit = max_mem // lane_mem
+        batch = list(a.chunks)
+        batch[axis] = max(n, 1)
+        for d in reversed(range(a.ndim)):
+            if d != axis:
+                batch[d] = max(min(batch[d], lanes_fit), 1)
+                lanes_fit //= batch[d]
+        keys = list(chunk_slices(a.shape, batch))
+
+        def sort_lanes(key):
+            data = a[key]
+            return np.argsort(data, axis=axis) if indices else np.sort(data, axis=axis)
+
+        for key, data in zip(keys, imap_chunks(sort_lanes, keys, a._nthreads)):
+            out[key] = data
+        return out
+
+    # A single lane does not fit in memory: sort runs that do and merge them
+    run_len = max(max_mem // itemsize // a.chunks[axis], 1) * a.chunks[axis]
+    runs = [(start, min(start + run_len, n)) for start in range(0, n, run_len)]
+    lane_shape = a.shape[:axis] + a.shape[axis + 1:]
+    for lane in np.ndindex(*lane_shape):
+        def key(start, stop, lane=lane):
+            return lane[:axis] + (slice(start, stop),) + lane[axis:]
+
+        run_kwargs = dict(chunks=(a.chunks[axis],), blocks=(a.blocks[axis],), urlpath=None)
+        run_values = ia.empty((n,), dtype=a.dtype, **run_kwargs)
+        run_indices = ia.empty((n,), dtype=np.int64, **run_kwargs)
+        for start, stop in runs:
+            data = a[key(start, stop)]
+            order = np.argsort(data, kind="stable")
+            run_values[start:stop] = data[order]
+            run_indices[start:stop] = order + start
+
+        def read(start, stop):
+            return run_values[start:stop], run_indices[start:stop]
+
+        written = [0]
+        pending = []
+
+        def write(values, idx):
+            # Merged data is written to the output in whole chunks along axis
+            pending.append(idx if indices else values)
+            total = sum(len(p) for p in pending)
+            end = written[0] + total
+            if end < n:
+                end = end // a.chunks[axis] * a.chunks[axis]
+            if end > written[0]:
+                data = np.concatenate(pending)
+                out[key(written[0], end)] = data[:end - written[0]]
+                pending[:] = [data[end - written[0]:]]
+                written[0] = end
+
+        _merge_runs(read, runs, itemsize, max_mem, write)
+    return out
+
+
+def sort(a, axis=-1, max_mem=2**28, **kwargs):
+    """Return a sorted copy of `a`, sorting along `axis`.
+
+    The lanes along `axis` are read in batches that fit in `max_mem` and sorted with
+    `nthreads` threads.  When a single lane does not fit, it is sorted in runs that do,
+    which are then merged (k-way) into the output, reading a part of every run at a time.
+
+    `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set,
+    the ones in `a` are used.
+
+    Parameters
+    ----------
+    a : IArray
+        The array to sort.
+    axis : int
+        The axis along which to sort.  Default is -1 (the last axis).
+    max_mem : int
+        The approximate maximum of memory (in bytes) to be used for the sort.  Default is
+        256 MB.
+
+    Returns
+    -------
+    IArray
+        The sorted array.
+
+    See Also
+    --------
+    argsort
+    """
+    return _sort(a, axis, max_mem, False, **kwargs)
+
+
+def argsort(a, axis=-1, max_mem=2**28, **kwargs):
+    """Return the indices (as int64) that would sort `a` along `axis`.
+
+    This works like :func:`sort` (see there for `axis`, `max_mem` and `kwargs`).
+
+    Returns
+    -------
+    IArray
+        The indices.
+
+    See Also
+    --------
+    sort
+    """
+    return _sort(a, axis, max_mem, True, **kwargs)
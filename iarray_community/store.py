@@ -0,0 +1,225 @@
+import os
+import ast
+from collections.abc import MutableMapping
+
+import msgpack
+import numpy as np
+import caterva as cat
+import iarray_community as ia
+from .info import InfoReporter
+
+
+# Name of the consolidated index inside the store directory
+STORE_INDEX = ".iarray_store"
+
+
+def array_metadata(arr):
+    """Return the metadata kept in the consolidated index for `arr`."""
+    nbytes = int(np.prod(arr.shape)) * arr.dtype.itemsize
+    return {
+        "type": arr.__class__.__name__,
+        "dtype": repr(np.lib.format.dtype_to_descr(arr.dtype)),
+        "shape": list(arr.shape),
+        "chunks": list(arr.chunks),
+        "blocks": list(arr.blocks),
+        "nbytes": nbytes,
+        "cbytes": int(nbytes / arr.cratio),
+    }
+
+
+def _stamp(path):
+    # Changes whenever the array at `path` is written or resized
+    stats = [e.stat() for e in os.scandir(path)] if os.path.isdir(path) else [os.stat(path)]
+    return [max(st.st_mtime_ns for st in stats), sum(st.st_size for st in stats)]
+
+
+class Store(MutableMapping):
+    """A collection of named arrays kept together under a single `urlpath`.
+
+    The metadata for all the arrays (type, dtype, shape, chunks, blocks and sizes) is kept in a
+    consolidated index that is loaded with a single read when the store is opened, so listing
+    the arrays or getting their metadata does not need to open any of them, and opening an
+    array is a constant time lookup.  Names may contain ``/`` for grouping arrays.
+
+    A caterva frame can only hold one array, so a store is a directory with the index and one
+    file per array, not a single file: it saves opening the arrays for listing them and
+    getting their metadata, but not the files (and inodes) for the arrays themselves.
+
+    Arrays can be written to or resized after they are added to the store.  The index keeps
+    the modification time and size of every array file, and the metadata for an array is
+    updated when the array is opened or its metadata is requested after it has changed.
+
+    Parameters
+    ----------
+    urlpath : str
+        The directory for the store.
+    mode : str
+        "r" for opening an existing store in read-only mode, "a" (the default) for opening
+        a store for reading and writing (it is created if needed), and "w" for creating
+        a new store (removing any existing store at `urlpath`; other files or directories
+        there are never removed).
+
+    See Also
+    --------
+    open
+    """
+
+    def __init__(self, urlpath, mode="a"):
+        if mode not in ("r", "a", "w"):
+            raise ValueError(f"mode must be 'r', 'a' or 'w', not {mode!r}")
+        self.urlpath = urlpath
+        self.mode = mode
+        index_path = os.path.join(urlpath, STORE_INDEX)
+        # Only remove stores, never unrelated files or directories
+        if mode == "w" and os.path.exists(index_path):
+            cat.remove(urlpath)
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as f:
+                self._index = msgpack.unpackb(f.read())["arrays"]
+        elif mode == "r":
+            raise FileNotFoundError(f"{urlpath} does not contain an ironArray store")
+        else:
+            if os.path.exists(urlpath):
+                raise FileExistsError("Remove file first!")
+            os.makedirs(urlpath)
+            self._index = {}
+            self._write_index()
+
+    def _write_index(self):
+        index_path = os.path.join(self.urlpath, STORE_INDEX)
+        with open(index_path + ".tmp", "wb") as f:
+            f.write(msgpack.packb({"version": 0, "arrays": self._index}))
+        os.replace(index_path + ".tmp", index_path)
+
+    def _check_writable(self):
+        if self.mode == "r":
+            raise ValueError("The store is opened in read-only mode")
+
+    def _path(self, name):
+        parts = name.split("/")
+        if name.startswith("/") or any(p in ("", ".", "..") for p in parts):
+            raise ValueError(f"Invalid array name {name!r}")
+        return os.path.join(self.urlpath, *parts) + ".iarray"
+
+    def __getitem__(self, name):
+        if name not in self._index:
+            raise KeyError(name)
+        arr = self._refresh(name)
+        return ia.open(self._path(name)) if arr is None else arr
+
+    def __setitem__(self, name, value):
+        """Store `value` (an ironArray array or a NumPy array) as `name`, replacing any previous array."""
+        if isinstance(value, (ia.IArray, ia.ColumnArray)):
+            self._create(name, value.copy)
+        else:
+            self._create(name, ia.numpy2iarray, np.asarray(value))
+
+    def __delitem__(self, name):
+        self._check_writable()
+        if name not in self._index:
+            raise KeyError(name)
+        cat.remove(self._path(name))
+        del self._index[name]
+        self._write_index()
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def _create(self, name, func, *args, **kwargs):
+        self._check_writable()
+        urlpath = self._path(name)
+        if name in self._index:
+            cat.remove(urlpath)
+            del self._index[name]
+        os.makedirs(os.path.dirname(urlpath), exist_ok=True)
+        arr = func(*args, urlpath=urlpath, **kwargs)
+        self._index[name] = dict(array_metadata(arr), stamp=_stamp(urlpath))
+        self._write_index()
+        return arr
+
+    def _refresh(self, name):
+        # Update the metadata for `name` if the array changed since it was indexed, returning
+        # the array if it had to be opened
+        urlpath = self._path(name)
+        stamp = _stamp(urlpath)
+        if self._index[name].get("stamp") == stamp:
+            return None
+        arr = ia.open(urlpath)
+        self._index[name] = dict(array_metadata(arr), stamp=stamp)
+        if self.mode != "r":
+            self._write_index()
+        return arr
+
+    def empty(self, name, shape, **kwargs):
+        """Create an empty array named `name` in the store.  See :func:`empty`."""
+        return self._create(name, ia.empty, shape, **kwargs)
+
+    def zeros(self, name, shape, **kwargs):
+        """Create an array named `name` filled with zeros in the store.  See :func:`zeros`."""
+        return self._create(name, ia.zeros, shape, **kwargs)
+
+    def ones(self, name, shape, **kwargs):
+        """Create an array named `name` filled with ones in the store.  See :func:`ones`."""
+        return self._create(name, ia.ones, shape, **kwargs)
+
+    def full(self, name, shape, fill_value, **kwargs):
+        """Create an array named `name` filled with `fill_value` in the store.  See :func:`full`."""
+        return self._create(name, ia.full, shape, fill_value, **kwargs)
+
+    def metadata(self, name):
+        """Return the metadata for array `name` from the consolidated index, without opening it.
+
+        Returns
+        -------
+        dict
+            The `type`, `dtype`, `shape`, `chunks`, `blocks`, `nbytes` and `cbytes` for the array.
+        """
+        if name not in self._index:
+            raise KeyError(name)
+        self._refresh(name)
+        meta = dict(self._index[name])
+        del meta["stamp"]
+        descr = ast.literal_eval(meta["dtype"])
+        meta["dtype"] = np.lib.format.descr_to_dtype(descr)
+        for key in ("shape", "chunks", "blocks"):
+            meta[key] = tuple(meta[key])
+        return meta
+
+    def consolidate(self):
+        """Rebuild the consolidated index from the arrays in the store.
+
+        The index is updated automatically when arrays are added or removed through the store,
+        and the metadata for arrays written to or resized is updated when they are accessed, so
+        this is only needed for updating the metadata for all the arrays at once.
+        """
+        self._check_writable()
+        self._index = {name: dict(array_metadata(ia.open(self._path(name))), stamp=_stamp(self._path(name)))
+                       for name in self._index}
+        self._write_index()
+
+    @property
+    def info(self):
+        """
+        Print information about this store.
+        """
+        return InfoReporter(self)
+
+    @property
+    def info_items(self):
+        for name in self._index:
+            self._refresh(name)
+        nbytes = sum(meta["nbytes"] for meta in self._index.values())
+        cbytes = sum(meta["cbytes"] for meta in self._index.values())
+        items = []
+        items += [("type", self.__class__.__name__)]
+        items += [("urlpath", self.urlpath)]
+        items += [("arrays", len(self))]
+        items += [("nbytes", nbytes)]
+        items += [("cratio", f"{nbytes / cbytes:.2f}" if cbytes else "-")]
+        return items
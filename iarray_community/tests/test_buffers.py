@@ -0,0 +1,83 @@
+import os
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((100, 80), (30, 20), (10, 10)),
+    ((20, 15, 12), (7, 8, 5), (3, 4, 5)),
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("max_mem", [2**20, 5000])
+@pytest.mark.parametrize("urlpath", [None, "test_buffers.iarray"])
+def test_batch_writes(shape, chunks, blocks, max_mem, urlpath):
+    if urlpath and os.path.exists(urlpath):
+        ia.remove(urlpath)
+    a = ia.zeros(shape, chunks=chunks, blocks=blocks, dtype=np.int32, urlpath=urlpath)
+    an = np.zeros(shape, dtype=np.int32)
+    rng = np.random.default_rng(0)
+
+    with a.batch_writes(max_mem=max_mem):
+        for i in range(200):
+            start = [rng.integers(0, s) for s in shape]
+            stop = [rng.integers(st, s) + 1 for st, s in zip(start, shape)]
+            key = tuple(slice(st, sp) for st, sp in zip(start, stop))
+            a[key] = i
+            an[key] = i
+            if i % 50 == 0:
+                # Reads see the buffered writes
+                np.testing.assert_array_equal(a[key], an[key])
+        a[(0,) * len(shape)] = -1
+        an[(0,) * len(shape)] = -1
+    np.testing.assert_array_equal(a[...], an)
+    if urlpath:
+        np.testing.assert_array_equal(ia.open(urlpath)[...], an)
+        ia.remove(urlpath)
+
+
+def test_batch_writes_flush():
+    a = ia.zeros((40, 40), chunks=(10, 10), blocks=(5, 5))
+    with a.batch_writes():
+        a[3:5, 3:5] = 1
+        # Operations on the whole array see the buffered writes too
+        assert ia.copy(a)[4, 4] == 1
+        assert a.slice((slice(0, 10), slice(0, 10)), chunks=(5, 5), blocks=(5, 5))[4, 4] == 1
+        a[13:15, 3:5] = 2
+        with pytest.raises(ValueError):
+            with a.batch_writes():
+                pass
+    assert a[14, 4] == 2
+
+
+def test_batch_writes_events():
+    events = []
+    ia.instrument.add_listener(events.append)
+    try:
+        a = ia.zeros((40, 40), chunks=(10, 10), blocks=(5, 5))
+        with a.batch_writes():
+            for i in range(10):
+                a[i, 0:15] = i
+    finally:
+        ia.instrument.remove_listener(events.append)
+    writes = [e for e in events if e.op == "write"]
+    assert [e.cache_hits for e in writes] == [0] + [2] * 9
+    assert events[-1].op == "flush"
+
+
+def test_chunk_cache():
+    from iarray_community.buffers import ChunkCache
+
+    an = np.arange(100 * 80).reshape(100, 80)
+    a = ia.numpy2iarray(an, chunks=(30, 20), blocks=(10, 10))
+    cache = ChunkCache(a, max_mem=2 * 30 * 20 * an.itemsize)
+    np.testing.assert_array_equal(cache.get((90, 60)), an[90:, 60:])
+    np.testing.assert_array_equal(cache.get((0, 20)), an[:30, 20:40])
+    cache.get((90, 60))
+    assert cache.hits == 1
+    # The least recently used chunk is dropped
+    cache.get((30, 0))
+    assert list(cache.chunks) == [(90, 60), (30, 0)]
@@ -0,0 +1,56 @@
+import os
+import pickle
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((100, 80), (30, 20), (10, 10)),
+    ((20, 15, 12), (7, 8, 5), (3, 4, 5)),
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("dtype", [np.float64, np.int16, [("a", np.int32), ("b", np.float64)]])
+def test_cframe(shape, chunks, blocks, dtype, tmp_path):
+    an = np.zeros(shape, dtype=dtype)
+    values = (np.arange(an.size) % 100).reshape(shape)
+    for name in an.dtype.names or [None]:
+        an[name or ...] = values
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks, codec=ia.Codec.ZSTD, clevel=3)
+
+    frame = a.to_cframe()
+    b = ia.from_cframe(frame)
+    assert b.dtype == a.dtype
+    assert b.chunks == chunks
+    assert b.blocks == blocks
+    assert b.codec == a.codec
+    np.testing.assert_array_equal(b[...], an)
+
+    urlpath = os.path.join(tmp_path, "frame.iarray")
+    c = ia.from_cframe(memoryview(frame), urlpath=urlpath)
+    np.testing.assert_array_equal(ia.open(urlpath)[...], an)
+    with pytest.raises(FileExistsError):
+        ia.from_cframe(frame, urlpath=urlpath)
+    assert c.to_cframe() == frame
+
+
+@pytest.mark.parametrize("protocol", [4, 5])
+def test_pickle(protocol):
+    if protocol > pickle.HIGHEST_PROTOCOL:
+        pytest.skip(f"pickle protocol {protocol} is not supported")
+    an = np.linspace(0, 1, 10_000).reshape(100, 100)
+    a = ia.numpy2iarray(an, chunks=(30, 40), blocks=(10, 10))
+
+    if protocol < 5:
+        b = pickle.loads(pickle.dumps(a, protocol=protocol))
+    else:
+        buffers = []
+        data = pickle.dumps(a, protocol=protocol, buffer_callback=buffers.append)
+        # The frame travels out-of-band
+        assert len(buffers) == 1
+        assert len(data) < 1000
+        b = pickle.loads(data, buffers=buffers)
+    np.testing.assert_array_equal(b[...], an)
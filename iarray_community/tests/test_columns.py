@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+import os
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((100,), (30,), (10,)),
+    ((55, 23), (10, 12), (2, 3)),
+]
+dtype = np.dtype([("timestamp", np.int64), ("lat", np.float32), ("lon", np.float32), ("value", np.float64)])
+
+
+def structured(shape):
+    size = int(np.prod(shape))
+    data = np.empty(shape, dtype=dtype)
+    data["timestamp"] = np.arange(size).reshape(shape)
+    data["lat"] = np.linspace(-90, 90, size).reshape(shape)
+    data["lon"] = np.linspace(-180, 180, size).reshape(shape)
+    data["value"] = np.linspace(0, 1, size).reshape(shape)
+    return data
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("columnar", [False, True])
+def test_structured(shape, chunks, blocks, columnar):
+    urlpath = "test_columns.iarray"
+    if os.path.exists(urlpath):
+        ia.remove(urlpath)
+
+    data = structured(shape)
+    with ia.config(chunks=chunks, blocks=blocks, urlpath=urlpath, columnar=columnar):
+        a = ia.numpy2iarray(data)
+        b = ia.open(urlpath)
+
+    assert isinstance(b, ia.ColumnArray) == columnar
+    assert b.dtype == dtype
+    assert b.shape == shape
+    np.testing.assert_array_equal(b[:], data)
+    np.testing.assert_array_equal(b["value"][3:7], data["value"][3:7])
+    np.testing.assert_array_equal(a[2:5], data[2:5])
+
+    if os.path.exists(urlpath):
+        ia.remove(urlpath)
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+def test_setitem(shape, chunks, blocks):
+    with ia.config(chunks=chunks, blocks=blocks, columnar=True):
+        a = ia.full(shape, (1, 2, 3, 4), dtype=dtype)
+        a[2:4] = (5, 6, 7, 8)
+
+    b = np.empty(shape, dtype=dtype)
+    b[...] = (1, 2, 3, 4)
+    b[2:4] = (5, 6, 7, 8)
+    np.testing.assert_array_equal(a[:], b)
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("columnar", [False, True])
+def test_copy(shape, chunks, blocks, columnar):
+    data = structured(shape)
+    with ia.config(chunks=chunks, blocks=blocks):
+        a = ia.numpy2iarray(data, columnar=columnar)
+        b = ia.copy(a, columnar=not columnar)
+
+    assert isinstance(b, ia.ColumnArray) != columnar
+    np.testing.assert_array_equal(b[:], data)
+
+
+@pytest.mark.parametrize("fields", [[("a/b", np.int32)], [("..", np.int32)], [("a", np.int32, (3,))]])
+def test_invalid_fields(fields):
+    urlpath = "test_columns.iarray"
+    if os.path.exists(urlpath):
+        ia.remove(urlpath)
+
+    with pytest.raises(ValueError):
+        ia.zeros((10,), dtype=np.dtype(fields), chunks=(5,), blocks=(5,), columnar=True, urlpath=urlpath)
+    assert not os.path.exists(urlpath)
+
+    # Row storage has no such restrictions
+    a = ia.zeros((10,), dtype=np.dtype(fields), chunks=(5,), blocks=(5,))
+    np.testing.assert_array_equal(a[:], np.zeros((10,), dtype=fields))
@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "shapes, chunks, blocks, axis"
+shapes_values = [
+    (((30,), (60,), (7,)), (30,), (10,), 0),
+    (((20, 30), (20, 17), (20, 40)), (10, 12), (2, 3), 1),
+    (((10, 30, 40), (15, 30, 40)), (10, 12, 25), (2, 3, 7), 0),
+    (((10, 30, 40), (15, 30, 40)), (6, 12, 25), (2, 3, 7), -3),
+]
+dtype_names = "dtype"
+dtype_values = [
+    np.float32,
+    np.int64,
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize(dtype_names, dtype_values)
+def test_concatenate(shapes, chunks, blocks, axis, dtype):
+    datas = [np.arange(int(np.prod(shape)), dtype=dtype).reshape(shape) + i for i, shape in enumerate(shapes)]
+    with ia.config(chunks=chunks, blocks=blocks):
+        arrays = [ia.numpy2iarray(data) for data in datas]
+    c = ia.concatenate(arrays, axis=axis)
+
+    assert c.chunks == chunks
+    np.testing.assert_array_equal(c[...], np.concatenate(datas, axis=axis))
+
+
+@pytest.mark.parametrize("axis", [0, 1, -1])
+@pytest.mark.parametrize(dtype_names, dtype_values)
+def test_stack(axis, dtype):
+    shape, chunks, blocks = (20, 30), (10, 12), (2, 3)
+    datas = [np.arange(int(np.prod(shape)), dtype=dtype).reshape(shape) * i for i in range(3)]
+    with ia.config(chunks=chunks, blocks=blocks):
+        arrays = [ia.numpy2iarray(data) for data in datas]
+    s = ia.stack(arrays, axis=axis)
+
+    np.testing.assert_array_equal(s[...], np.stack(datas, axis=axis))
+
+
+def test_copy_defaults():
+    data = np.linspace(0, 1, 1000).reshape(10, 100)
+    a = ia.numpy2iarray(data, chunks=(5, 30), blocks=(5, 10))
+    b = ia.copy(a)
+    assert b.chunks == a.chunks
+    assert b.blocks == a.blocks
+    np.testing.assert_array_equal(b[...], data)
+
+
+def test_stack_chunks():
+    arrays = [ia.arange(100, chunks=(50,), blocks=(10,)) for _ in range(5)]
+    s = ia.stack(arrays, axis=1)
+    assert s.chunks == (50, 5)
+    assert s.blocks == (10, 1)
+    np.testing.assert_array_equal(s[...], np.stack([np.arange(100)] * 5, axis=1))
+
+
+@pytest.mark.parametrize("func, axis", [(ia.concatenate, 2), (ia.concatenate, -3), (ia.stack, 3), (ia.stack, -4)])
+def test_invalid_axis(func, axis):
+    arrays = [ia.zeros((10, 10), chunks=(5, 5), blocks=(2, 2)) for _ in range(2)]
+    with pytest.raises(ValueError, match="out of bounds"):
+        func(arrays, axis=axis)
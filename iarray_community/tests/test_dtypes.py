@@ -0,0 +1,96 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+import os
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((55, 123), (10, 12), (2, 3)),
+]
+dtype_names = "dtype"
+dtype_values = [
+    np.float16,
+    np.complex64,
+    np.complex128,
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize(dtype_names, dtype_values)
+def test_roundtrip(shape, chunks, blocks, dtype):
+    urlpath = "test_dtypes.iarray"
+    if os.path.exists(urlpath):
+        ia.remove(urlpath)
+
+    b = np.linspace(0, 1, int(np.prod(shape)), dtype=dtype).reshape(shape)
+    if np.dtype(dtype).kind == "c":
+        b = b + 1j * b[::-1]
+    with ia.config(chunks=chunks, blocks=blocks, urlpath=urlpath):
+        c = ia.numpy2iarray(b)
+        d = ia.open(urlpath)
+
+    assert c.dtype == dtype
+    assert d.dtype == dtype
+    np.testing.assert_array_equal(b, d[:])
+
+    if os.path.exists(urlpath):
+        ia.remove(urlpath)
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize(dtype_names, dtype_values)
+def test_full(shape, chunks, blocks, dtype):
+    with ia.config(chunks=chunks, blocks=blocks):
+        a = ia.full(shape, 3.5, dtype=dtype)
+    np.testing.assert_array_equal(a[:], np.full(shape, 3.5, dtype=dtype))
+
+
+def test_half_filters():
+    cfg = ia.Config(dtype=np.float16)
+    assert cfg.filters == [ia.Filter.BITSHUFFLE]
+    cfg = ia.Config(dtype=np.float16, filters=[ia.Filter.DELTA])
+    assert cfg.filters == [ia.Filter.DELTA]
+    cfg = ia.Config(dtype=np.float32)
+    assert cfg.filters == [ia.Filter.SHUFFLE]
+    # Explicit filters are kept, and default ones follow the dtype
+    cfg = ia.Config(dtype=np.float16, filters=[ia.Filter.SHUFFLE])
+    assert cfg.filters == [ia.Filter.SHUFFLE]
+    assert cfg._replace(dtype=np.float32).filters == [ia.Filter.SHUFFLE]
+    with ia.config(dtype=np.float16):
+        assert ia.Config(dtype=np.float32).filters == [ia.Filter.SHUFFLE]
+    a = ia.numpy2iarray(np.ones((10, 10), dtype=np.float16), chunks=(5, 5), blocks=(5, 5))
+    assert a._cfg.filters == [ia.Filter.BITSHUFFLE]
+    a = ia.numpy2iarray(np.ones((10, 10), dtype=np.float16), chunks=(5, 5), blocks=(5, 5),
+                        filters=[ia.Filter.SHUFFLE])
+    assert a._cfg.filters == [ia.Filter.SHUFFLE]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+def test_bfloat16(shape, chunks, blocks):
+    ml_dtypes = pytest.importorskip("ml_dtypes")
+    dtype = np.dtype(ml_dtypes.bfloat16)
+    urlpath = "test_dtypes.iarray"
+    if os.path.exists(urlpath):
+        ia.remove(urlpath)
+
+    b = np.linspace(0, 1, int(np.prod(shape)), dtype=np.float32).astype(dtype).reshape(shape)
+    with ia.config(chunks=chunks, blocks=blocks, urlpath=urlpath):
+        c = ia.numpy2iarray(b)
+        d = ia.open(urlpath)
+
+    assert c._cfg.filters == [ia.Filter.BITSHUFFLE]
+    assert d.dtype == dtype
+    np.testing.assert_array_equal(b, d[:])
+
+    if os.path.exists(urlpath):
+        ia.remove(urlpath)
+
+
+def test_subarray_dtype():
+    with pytest.raises(TypeError):
+        ia.zeros((10,), dtype=np.dtype((np.float64, 3)), chunks=(5,), blocks=(5,))
+    # Subarrays are fine as fields of structured dtypes
+    dtype = np.dtype([("a", np.float64, (3,))])
+    a = ia.zeros((10,), dtype=dtype, chunks=(5,), blocks=(5,))
+    np.testing.assert_array_equal(a[:], np.zeros((10,), dtype=dtype))
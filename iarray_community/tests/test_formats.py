@@ -0,0 +1,84 @@
+import os
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((100, 80), (30, 20), (10, 10)),
+    ((20, 15, 12), (7, 8, 5), (3, 4, 5)),
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("dtype", [np.float64, np.int16])
+def test_npy(shape, chunks, blocks, dtype, tmp_path):
+    an = np.arange(np.prod(shape), dtype=dtype).reshape(shape)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+    path = os.path.join(tmp_path, "test.npy")
+
+    ia.to_npy(a, path)
+    np.testing.assert_array_equal(np.load(path), an)
+    b = ia.from_npy(path, chunks=chunks, blocks=blocks)
+    assert b.dtype == dtype
+    np.testing.assert_array_equal(b[...], an)
+
+
+def test_npy_default_chunks(tmp_path):
+    an = np.linspace(0, 1, 1000 * 1000).reshape(1000, 1000)
+    path = os.path.join(tmp_path, "test.npy")
+    np.save(path, an)
+
+    b = ia.from_npy(path)
+    assert b.chunks == (500, 1000)
+    assert int(np.prod(b.blocks)) * 8 <= 2**18
+    np.testing.assert_array_equal(b[...], an)
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+def test_hdf5(shape, chunks, blocks, tmp_path):
+    h5py = pytest.importorskip("h5py")
+    an = np.linspace(0, 1, int(np.prod(shape))).reshape(shape)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+    path = os.path.join(tmp_path, "test.h5")
+
+    ia.to_hdf5(a, path, name="x")
+    with h5py.File(path, "r") as f:
+        assert f["x"].chunks == chunks
+        np.testing.assert_array_equal(f["x"][...], an)
+    b = ia.from_hdf5(path, name="x")
+    assert b.chunks == chunks
+    np.testing.assert_array_equal(b[...], an)
+
+
+def test_hdf5_contiguous(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    an = np.arange(300 * 200, dtype=np.int32).reshape(300, 200)
+    path = os.path.join(tmp_path, "test.h5")
+    with h5py.File(path, "w") as f:
+        f.create_dataset("data", data=an)
+        assert f["data"].chunks is None
+
+    b = ia.from_hdf5(path)
+    assert b.chunks == an.shape
+    np.testing.assert_array_equal(b[...], an)
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+def test_zarr(shape, chunks, blocks, tmp_path):
+    zarr = pytest.importorskip("zarr")
+    an = np.linspace(0, 1, int(np.prod(shape))).reshape(shape)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+    path = os.path.join(tmp_path, "test.zarr")
+
+    ia.to_zarr(a, path)
+    z = zarr.open_array(path, mode="r")
+    assert z.chunks == chunks
+    np.testing.assert_array_equal(z[...], an)
+    b = ia.from_zarr(path)
+    assert b.chunks == chunks
+    np.testing.assert_array_equal(b[...], an)
+    c = ia.from_zarr(path, chunks=(10,) * len(shape), blocks=(5,) * len(shape))
+    assert c.chunks == (10,) * len(shape)
+    np.testing.assert_array_equal(c[...], an)
@@ -0,0 +1,56 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((100,), (30,), (10,)),
+    ((55, 123), (10, 12), (2, 3)),
+    ((20, 30, 40), (10, 12, 25), (2, 3, 7)),
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+def test_chunk_info(shape, chunks, blocks):
+    data = np.random.default_rng(0).normal(size=shape)
+    data[:chunks[0]] = 0
+    a = ia.numpy2iarray(data, chunks=chunks, blocks=blocks)
+
+    cinfo = a.chunk_info()
+    assert len(cinfo) == a.nchunks
+    assert cinfo["nbytes"].sum() == a.size
+    assert tuple(cinfo["coords"][-1]) == tuple(-(-s // c) - 1 for s, c in zip(shape, chunks))
+    # The first row of chunks is all zeros
+    zeros = cinfo["coords"][:, 0] == 0
+    assert cinfo["constant"][zeros].all()
+    assert not cinfo["constant"][~zeros].any()
+    assert cinfo["cratio"][zeros].min() > cinfo["cratio"][~zeros].max()
+    assert (cinfo["codec"] == "LZ4").all()
+
+
+def test_info_extended():
+    a = ia.zeros((100, 100), chunks=(10, 20), blocks=(5, 5))
+    a[:50, :50] = np.random.default_rng(0).normal(size=(50, 50))
+
+    text = repr(a.info_extended)
+    assert text.startswith(repr(a.info))
+    assert "constant chunks: 35 of 50" in text
+    assert "cratio heatmap" in text
+    html = a.info_extended._repr_html_()
+    assert html.startswith(a.info._repr_html_())
+    assert "iarray-info-heatmap" in html
+
+
+def test_chunk_info_sample():
+    a = ia.zeros((100, 100), chunks=(10, 10), blocks=(5, 5))
+    cinfo = a.chunk_info(sample=7)
+    assert len(cinfo) == 7
+    assert tuple(cinfo["coords"][0]) == (0, 0) and tuple(cinfo["coords"][-1]) == (9, 9)
+    assert cinfo["constant"].all()
+
+    # The extended info only analyzes a sample of the chunks
+    a = ia.zeros((1000, 1000), chunks=(10, 20), blocks=(5, 5))
+    text = repr(a.info_extended)
+    assert f"sampled chunks : {ia.info.INFO_EXTENDED_SAMPLE} of 5000" in text
+    assert "cratio heatmap" not in text
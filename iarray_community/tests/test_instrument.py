@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+@pytest.fixture
+def events():
+    events = []
+    ia.instrument.add_listener(events.append)
+    yield events
+    ia.instrument.remove_listener(events.append)
+
+
+def test_events(events):
+    shape, chunks, blocks = (100, 100), (20, 20), (10, 10)
+    with ia.config(chunks=chunks, blocks=blocks):
+        a = ia.zeros(shape, dtype=np.float64)
+        a[5:25, 0:10] = 1
+        a[:]
+        a.resize((120, 100))
+        ia.copy(a)
+
+    assert [e.op for e in events] == ["create", "write", "read", "resize", "copy"]
+    create, write, read, _, _ = events
+    assert create.nbytes == 100 * 100 * 8
+    assert create.nchunks == 25
+    assert write.nbytes == 20 * 10 * 8
+    assert write.nchunks == 2
+    assert read.nchunks == 25
+    assert all(e.wall_time >= 0 for e in events)
+    assert write.site.endswith(f"test_instrument.py:{test_events.__code__.co_firstlineno + 4}")
+
+
+def test_aggregator():
+    agg = ia.instrument.Aggregator()
+    ia.instrument.add_listener(agg)
+    try:
+        a = ia.ones((10, 10), chunks=(5, 5), blocks=(5, 5))
+        for i in range(3):
+            a[i]
+    finally:
+        ia.instrument.remove_listener(agg)
+
+    assert len(agg.slowest(1)) == 1
+    ops = {op: s for (op, _), s in agg.stats.items()}
+    assert ops["read"].calls == 3
+    assert ops["read"].nchunks == 6
+    text = agg.to_prometheus()
+    assert "# TYPE iarray_calls_total counter" in text
+    assert 'iarray_calls_total{op="read",site="' in text
@@ -0,0 +1,62 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "ashape, achunks, bshape, bchunks"
+shapes_values = [
+    ((100, 80), (30, 20), (80, 70), (20, 25)),
+    ((55, 123), (10, 12), (123, 40), (17, 9)),
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("max_mem", [2**20, 2**16, 2**13])
+def test_matmul(ashape, achunks, bshape, bchunks, dtype, max_mem):
+    rng = np.random.default_rng(0)
+    an = rng.normal(size=ashape).astype(dtype)
+    bn = rng.normal(size=bshape).astype(dtype)
+    a = ia.numpy2iarray(an, chunks=achunks, blocks=achunks)
+    b = ia.numpy2iarray(bn, chunks=bchunks, blocks=bchunks)
+
+    c = ia.matmul(a, b, max_mem=max_mem, nthreads=2)
+    assert c.dtype == dtype
+    assert c.chunks == (achunks[0], bchunks[1])
+    rtol = 1e-5 if dtype == np.float32 else 1e-10
+    np.testing.assert_allclose(c[...], an @ bn, rtol=rtol, atol=rtol)
+
+    d = ia.matmul(a, b, chunks=(16, 16), blocks=(8, 8))
+    assert d.chunks == (16, 16)
+    np.testing.assert_allclose(d[...], an @ bn, rtol=rtol, atol=rtol)
+    np.testing.assert_allclose((a @ b)[...], an @ bn, rtol=rtol, atol=rtol)
+
+
+def test_matmul_errors():
+    a = ia.ones((10, 10), chunks=(5, 5), blocks=(5, 5))
+    b = ia.ones((11, 10), chunks=(5, 5), blocks=(5, 5))
+    with pytest.raises(ValueError):
+        a @ b
+    # The output chunks must fit in max_mem
+    with pytest.raises(ValueError):
+        ia.matmul(a, a, max_mem=100)
+
+
+def test_matmul_reads():
+    rng = np.random.default_rng(0)
+    an = rng.normal(size=(100, 60))
+    bn = rng.normal(size=(60, 50))
+    a = ia.numpy2iarray(an, chunks=(20, 25), blocks=(10, 25))
+    b = ia.numpy2iarray(bn, chunks=(17, 9), blocks=(17, 9))
+
+    events = []
+    ia.instrument.add_listener(events.append)
+    try:
+        c = ia.matmul(a, b)
+    finally:
+        ia.instrument.remove_listener(events.append)
+    np.testing.assert_allclose(c[...], an @ bn)
+    # Both operands are read only once
+    for arr in (a, b):
+        nbytes = sum(e.nbytes for e in events if e.op == "read" and e.shape == arr.shape)
+        assert nbytes == arr.shape[0] * arr.shape[1] * 8
@@ -0,0 +1,127 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((100, 80), (30, 20), (10, 10)),
+    ((20, 15, 12), (7, 8, 5), (3, 4, 5)),
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("dtype", [np.float64, np.int32])
+def test_ufuncs(shape, chunks, blocks, dtype):
+    an = np.arange(np.prod(shape), dtype=dtype).reshape(shape)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+
+    for res, expected in [(np.sin(a), np.sin(an)), (a + 1, an + 1), (2 * a - a, an), (a * an, an * an),
+                          (a > 50, an > 50), (np.add(a, a), an + an)]:
+        assert isinstance(res, ia.IArray)
+        assert res.chunks == chunks
+        assert res.dtype == expected.dtype
+        np.testing.assert_allclose(res[...], expected)
+
+    np.testing.assert_array_equal(np.maximum(a, 7)[...], np.maximum(an, 7))
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+def test_functions(shape, chunks, blocks):
+    an = np.linspace(0.9, 1.1, int(np.prod(shape))).reshape(shape)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+
+    np.testing.assert_array_equal(np.where(a > 1, a, 0)[...], np.where(an > 1, an, 0))
+    np.testing.assert_array_equal(np.clip(a, 0.95, 1.05)[...], np.clip(an, 0.95, 1.05))
+    np.testing.assert_array_equal(np.concatenate([a, a], axis=1)[...], np.concatenate([an, an], axis=1))
+    np.testing.assert_array_equal(np.stack([a, a])[...], np.stack([an, an]))
+
+    for name in ("sum", "prod", "min", "max", "mean"):
+        func = getattr(np, name)
+        np.testing.assert_allclose(func(a), func(an))
+        np.testing.assert_allclose(getattr(a, name)(), func(an))
+        res = func(a, axis=1)
+        assert isinstance(res, ia.IArray)
+        np.testing.assert_allclose(res[...], func(an, axis=1))
+    np.testing.assert_allclose(np.add.reduce(a)[...], np.add.reduce(an))
+
+    # Functions without a chunked implementation are computed by NumPy
+    np.testing.assert_allclose(np.median(a), np.median(an))
+    np.testing.assert_allclose(np.asarray(a), an)
+
+
+def test_matmul():
+    an = np.arange(60.).reshape(6, 10)
+    a = ia.numpy2iarray(an, chunks=(4, 4), blocks=(2, 2))
+    b = ia.numpy2iarray(an.T.copy(), chunks=(4, 4), blocks=(2, 2))
+    np.testing.assert_allclose(np.matmul(a, b)[...], an @ an.T)
+    np.testing.assert_allclose(np.dot(a, b)[...], an @ an.T)
+
+
+def test_shape_mismatch():
+    a = ia.ones((10, 10), chunks=(5, 5), blocks=(5, 5))
+    b = ia.ones((10, 5), chunks=(5, 5), blocks=(5, 5))
+    with pytest.raises(ValueError):
+        a + b
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+def test_out(shape, chunks, blocks):
+    an = np.linspace(0, 1, int(np.prod(shape))).reshape(shape)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+
+    b = np.add(a, 1, out=a)
+    assert b is a
+    np.testing.assert_allclose(a[...], an + 1)
+    a *= 2
+    np.testing.assert_allclose(a[...], (an + 1) * 2)
+    c = ia.zeros(shape, dtype=np.float32, chunks=chunks, blocks=blocks)
+    np.sqrt(a, out=c)
+    np.testing.assert_allclose(c[...], np.sqrt((an + 1) * 2), rtol=1e-6)
+
+    # out can be the only ironArray array
+    d = ia.zeros(shape, chunks=chunks, blocks=blocks)
+    assert np.add(an, 1, out=d) is d
+    np.testing.assert_allclose(d[...], an + 1)
+    np.sqrt(d.view[...], out=d)
+    np.testing.assert_allclose(d[...], np.sqrt(an + 1))
+
+    # NumPy casting rules apply
+    with pytest.raises(TypeError):
+        np.add(a, 1, out=ia.zeros(shape, dtype=np.int64, chunks=chunks, blocks=blocks))
+    # Operations not writing into out chunk by chunk raise instead of silently ignoring it
+    with pytest.raises(TypeError):
+        np.add.reduce(a, out=c)
+    with pytest.raises(TypeError):
+        np.cumsum(a, out=c)
+
+
+def test_views():
+    an = np.arange(200.).reshape(10, 20)
+    a = ia.numpy2iarray(an, chunks=(4, 8), blocks=(2, 4))
+    b = ia.numpy2iarray(an[2:7], chunks=(4, 8), blocks=(2, 4))
+    np.testing.assert_array_equal((a + a.view[...])[...], an + an)
+    np.testing.assert_array_equal((b * a.view[2:7])[...], an[2:7] * an[2:7])
+    np.testing.assert_array_equal(np.add(b, a.view[2:7]), an[2:7] * 2)
+
+
+@pytest.mark.filterwarnings("ignore:'where' used without 'out'")
+def test_where_kwarg():
+    an = np.arange(10.)
+    a = ia.numpy2iarray(an, chunks=(4,), blocks=(2,))
+    b = np.add(a, 1, where=an > 5, out=np.zeros(10))
+    np.testing.assert_array_equal(b, np.where(an > 5, an + 1, 0))
+    # Without out, the result where the mask is false is undefined in NumPy, but it does not fail
+    assert np.add(a, 1, where=an > 5)[6:].tolist() == (an[6:] + 1).tolist()
+
+
+def test_hash_and_bool():
+    a = ia.ones((10,), chunks=(5,), blocks=(5,))
+    assert hash(a) == hash(a)
+    assert {a: 1}[a] == 1
+    with pytest.raises(ValueError):
+        bool(a == a)
+    with pytest.raises(ValueError):
+        bool(ia.ones((0,), chunks=(5,), blocks=(5,)))
+    assert bool(ia.ones((1,), chunks=(1,), blocks=(1,)))
+    assert not bool(ia.zeros((1, 1), chunks=(1, 1), blocks=(1, 1)))
@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((1000,), (300,), (100,)),
+    ((55, 123), (10, 12), (2, 3)),
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("func, args", [("uniform", (2., 5.)), ("normal", (3., 0.5)), ("randint", (10, 20))])
+def test_random(shape, chunks, blocks, func, args):
+    with ia.config(chunks=chunks, blocks=blocks):
+        a = getattr(ia.random, func)(shape, *args, seed=1234)
+        b = getattr(ia.random, func)(shape, *args, seed=1234, nthreads=4)
+        c = getattr(ia.random, func)(shape, *args, seed=4321)
+
+    assert a.shape == shape
+    np.testing.assert_array_equal(a[...], b[...])
+    assert not np.array_equal(a[...], c[...])
+    data = a[...]
+    if func == "normal":
+        assert abs(data.mean() - 3.) < 0.1
+        assert abs(data.std() - 0.5) < 0.1
+    else:
+        assert data.min() >= args[0]
+        assert data.max() < args[1]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("dtype", [np.float64, np.int32])
+def test_arange(shape, chunks, blocks, dtype):
+    size = int(np.prod(shape))
+    with ia.config(chunks=chunks, blocks=blocks, dtype=dtype):
+        a = ia.arange(3, 3 + 2 * size, 2, shape=shape)
+    np.testing.assert_array_equal(a[...], np.arange(3, 3 + 2 * size, 2, dtype=dtype).reshape(shape))
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("endpoint", [True, False])
+def test_linspace(shape, chunks, blocks, endpoint):
+    size = int(np.prod(shape))
+    with ia.config(chunks=chunks, blocks=blocks, nthreads=3):
+        a = ia.linspace(-1, 7, size, endpoint=endpoint, shape=shape)
+    np.testing.assert_allclose(a[...], np.linspace(-1, 7, size, endpoint=endpoint).reshape(shape))
+    if endpoint:
+        assert a[...].flat[-1] == 7
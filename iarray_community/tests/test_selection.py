@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((100, 80), (30, 20), (10, 10)),
+    ((20, 15, 12), (7, 8, 5), (3, 4, 5)),
+    ((5000,), (700,), (100,)),
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("dtype", [np.float64, np.int32])
+def test_compress(shape, chunks, blocks, dtype):
+    an = (np.random.default_rng(0).normal(size=shape) * 100).astype(dtype)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+
+    for threshold in [-1000, 150, 1000]:
+        b = a[a > threshold]
+        assert b.ndim == 1 and b.dtype == a.dtype
+        np.testing.assert_array_equal(b[...], an[an > threshold])
+        b = a[an > threshold]
+        np.testing.assert_array_equal(b[...], an[an > threshold])
+        b = ia.compress(lambda x: x < -threshold, a, chunks=(100,), blocks=(20,))
+        np.testing.assert_array_equal(b[...], an[an < -threshold])
+
+
+def test_compress_sparse_mask():
+    an = np.arange(60 * 50).reshape(60, 50)
+    a = ia.numpy2iarray(an, chunks=(20, 20), blocks=(10, 10))
+    mask = ia.zeros(a.shape, dtype=np.bool_, chunks=(20, 20), blocks=(10, 10))
+    mask[45, 7] = True
+    mask[3, 49] = True
+    np.testing.assert_array_equal(a[mask][...], [an[3, 49], an[45, 7]])
+
+
+@pytest.mark.parametrize("max_mem", [2**14, 2**10, 2**8])
+def test_compress_max_mem(max_mem):
+    # Wide arrays, where a slab of chunks along the first dim does not fit in max_mem
+    an = np.random.default_rng(0).normal(size=(12, 40, 30))
+    a = ia.numpy2iarray(an, chunks=(6, 20, 10), blocks=(3, 10, 10))
+
+    np.testing.assert_array_equal(ia.compress(a > 1, a, max_mem=max_mem)[...], an[an > 1])
+    sizes = []
+
+    def condition(x):
+        sizes.append(x.nbytes)
+        return x < -1
+
+    np.testing.assert_array_equal(ia.compress(condition, a, max_mem=max_mem)[...], an[an < -1])
+    assert max(sizes) <= max(max_mem, an.itemsize)
+
+
+@pytest.mark.parametrize("condition", [True, False, np.True_, np.array(False)])
+def test_compress_scalar(condition):
+    an = np.arange(100.).reshape(10, 10)
+    a = ia.numpy2iarray(an, chunks=(5, 5), blocks=(5, 5))
+    expected = an[np.asarray(condition)]
+    for b in (ia.compress(condition, a), a[condition]):
+        assert b.shape == expected.shape
+        assert b.chunks == (1, 5, 5)
+        np.testing.assert_array_equal(b[...], expected)
+
+
+def test_compress_errors():
+    a = ia.arange(0, 100, shape=(10, 10), chunks=(5, 5), blocks=(5, 5))
+    with pytest.raises(ValueError):
+        ia.compress(np.ones((10, 5), dtype=bool), a)
+    with pytest.raises(ValueError):
+        ia.compress(a, a)
+    with pytest.raises(TypeError):
+        ia.compress(1, a)
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+import pytest
+import numpy as np
+import caterva.ndarray
+import iarray_community as ia
+from iarray_community.iarray import process_key
+
+
+def test_lazy_import():
+    code = ("import sys; import iarray_community as ia; "
+            "assert 'caterva' not in sys.modules and 'iarray_community.iarray' not in sys.modules; "
+            "assert 'zeros' in dir(ia); ia.zeros; assert 'caterva' in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True)
+    with pytest.raises(AttributeError):
+        ia.foo
+
+
+def test_star_import():
+    namespace = {}
+    exec("from iarray_community import *", namespace)
+    assert namespace["zeros"] is ia.zeros
+    assert namespace["IArray"] is ia.IArray
+
+
+@pytest.mark.parametrize("shape", [(10,), (6, 0, 4), (5, 1, 7)])
+@pytest.mark.parametrize("key", [0, -1, np.int64(2), slice(None), slice(2, None), slice(-3, -1), slice(4, 2),
+                                 slice(-100, 100, 1), Ellipsis, (Ellipsis, 0), (1, Ellipsis), (slice(1, 3), 0)])
+def test_process_key(shape, key):
+    try:
+        expected = caterva.ndarray.process_key(key, shape)
+    except IndexError:
+        with pytest.raises(IndexError):
+            process_key(key, shape)
+        return
+    slices, mask = process_key(key, shape)
+    assert mask == expected[1]
+    assert [(s.start, s.stop) for s in slices] == [(s.start, s.stop) for s in expected[0]]
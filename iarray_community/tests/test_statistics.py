@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+import iarray_community.statistics as statistics
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((100, 80), (30, 20), (10, 10)),
+    ((20, 15, 12), (7, 8, 5), (3, 4, 5)),
+    ((5000,), (700,), (100,)),
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("dtype", [np.float64, np.int32])
+def test_histogram(shape, chunks, blocks, dtype):
+    an = (np.random.default_rng(0).normal(size=shape) * 100).astype(dtype)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+
+    for bins, range_ in [(10, None), (33, (-50, 50)), ([-300, -10, 0, 5, 300], None)]:
+        hist, edges = ia.histogram(a, bins, range_)
+        hist2, edges2 = np.histogram(an, bins, range_)
+        np.testing.assert_array_equal(hist, hist2)
+        np.testing.assert_allclose(edges, edges2)
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("dtype", [np.float64, np.int16])
+@pytest.mark.parametrize("max_candidates", [2**20, 50])
+def test_quantile(shape, chunks, blocks, dtype, max_candidates, monkeypatch):
+    monkeypatch.setattr(statistics, "QUANTILE_MAX_CANDIDATES", max_candidates)
+    an = (np.random.default_rng(0).lognormal(size=shape) * 10).astype(dtype)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+    q = [0, 0.01, 0.25, 0.5, 0.9, 0.999, 1]
+
+    np.testing.assert_allclose(ia.quantile(a, q), np.quantile(an, q))
+    np.testing.assert_allclose(ia.quantile(a, 0.3), np.quantile(an, 0.3))
+    np.testing.assert_allclose(ia.quantile(a.view[1:], 0.3), np.quantile(an[1:], 0.3))
+
+    sketch = ia.quantile(a, q, method="sketch")
+    np.testing.assert_allclose(sketch[[0, -1]], [an.min(), an.max()])
+    # The rank error is bounded by the size of the summaries (values can be repeated in integers)
+    sorted_an = np.sort(an, axis=None)
+    if an.dtype.kind == "i":
+        lower = np.searchsorted(sorted_an, np.floor(sketch), side="left") / an.size
+        upper = np.searchsorted(sorted_an, np.ceil(sketch), side="right") / an.size
+    else:
+        lower = upper = np.searchsorted(sorted_an, sketch) / an.size
+    assert np.all((lower - 0.01 <= q) & (q <= upper + 0.01))
+
+
+@pytest.mark.parametrize("sorted_data", [False, True])
+def test_quantile_sketch_many_chunks(sorted_data):
+    an = np.random.default_rng(0).normal(size=200_000)
+    if sorted_data:
+        an.sort()
+    # Thousands of chunks, so that summaries are compacted many times
+    a = ia.numpy2iarray(an, chunks=(50,), blocks=(50,))
+    q = np.linspace(0, 1, 1001)
+
+    sketch = ia.quantile(a, q, method="sketch")
+    ranks = np.searchsorted(np.sort(an), sketch) / an.size
+    assert np.abs(ranks - q).max() <= 1 / statistics.SKETCH_SIZE
+
+
+def test_quantile_errors():
+    a = ia.numpy2iarray(np.array([1., np.nan, 3.]), chunks=(2,), blocks=(2,))
+    assert np.isnan(ia.quantile(a, 0.5))
+    with pytest.raises(ValueError):
+        ia.quantile(a, 1.5)
+    with pytest.raises(ValueError):
+        ia.quantile(a, 0.5, method="foo")
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("max_mem", [2**20, 3000])
+def test_sort(shape, chunks, blocks, max_mem):
+    an = np.random.default_rng(0).normal(size=shape)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+
+    for axis in range(-1, len(shape) - 1):
+        b = ia.sort(a, axis=axis, max_mem=max_mem)
+        assert b.chunks == chunks
+        np.testing.assert_array_equal(b[...], np.sort(an, axis=axis))
+        c = ia.argsort(a, axis=axis, max_mem=max_mem)
+        assert c.dtype == np.int64
+        np.testing.assert_array_equal(c[...], np.argsort(an, axis=axis))
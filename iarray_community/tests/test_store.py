@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+import os
+
+
+@pytest.fixture
+def urlpath():
+    urlpath = "test_store.iarray"
+    if os.path.exists(urlpath):
+        ia.remove(urlpath)
+    yield urlpath
+    if os.path.exists(urlpath):
+        ia.remove(urlpath)
+
+
+def test_store(urlpath):
+    data = np.linspace(0, 1, 1000, dtype=np.float32).reshape(10, 100)
+    with ia.config(chunks=(5, 50), blocks=(5, 10)):
+        store = ia.Store(urlpath, mode="w")
+        store["temperature"] = data
+        store["pressure"] = ia.ones((10, 100))
+        store.zeros("precip/daily", (20, 100), dtype=np.int32)
+
+    assert list(store) == ["temperature", "pressure", "precip/daily"]
+    assert os.path.isfile(os.path.join(urlpath, "precip", "daily.iarray"))
+
+    store = ia.open(urlpath)
+    assert isinstance(store, ia.Store)
+    assert len(store) == 3
+    meta = store.metadata("precip/daily")
+    assert meta["shape"] == (20, 100)
+    assert meta["dtype"] == np.int32
+    assert meta["chunks"] == (5, 50)
+    np.testing.assert_array_equal(store["temperature"][:], data)
+    np.testing.assert_array_equal(store["precip/daily"][:], 0)
+
+    del store["pressure"]
+    assert "pressure" not in ia.Store(urlpath, mode="r")
+    with pytest.raises(KeyError):
+        store["pressure"]
+
+
+def test_consolidate(urlpath):
+    store = ia.Store(urlpath)
+    store.ones("a", (10,), chunks=(5,), blocks=(5,))
+    a = store.zeros("b", (1000,), chunks=(100,), blocks=(50,))
+    store["a"].resize((20,))
+    a[:] = np.random.default_rng(0).normal(size=1000)
+
+    # Arrays changed outside the store are detected, also in read-only mode
+    ro_store = ia.Store(urlpath, mode="r")
+    assert ro_store.metadata("a")["shape"] == (20,)
+    assert ro_store.metadata("b")["cbytes"] > 1000
+    assert store.metadata("a")["shape"] == (20,)
+    assert ia.Store(urlpath, mode="r")._index["a"]["shape"] == [20]
+    store.consolidate()
+    assert store.metadata("b")["cbytes"] > 1000
+
+
+def test_readonly(urlpath):
+    with pytest.raises(FileNotFoundError):
+        ia.Store(urlpath, mode="r")
+    ia.Store(urlpath)
+    store = ia.Store(urlpath, mode="r")
+    with pytest.raises(ValueError):
+        store.zeros("a", (10,), chunks=(5,), blocks=(5,))
+    with pytest.raises(ValueError):
+        store.zeros("../a", (10,), chunks=(5,), blocks=(5,))
+
+
+def test_overwrite(urlpath):
+    store = ia.Store(urlpath, mode="w")
+    store.ones("a", (10,), chunks=(5,), blocks=(5,))
+    store = ia.Store(urlpath, mode="w")
+    assert len(store) == 0
+    ia.remove(urlpath)
+
+    # Directories that are not stores are never removed
+    os.makedirs(urlpath)
+    with open(os.path.join(urlpath, "data.txt"), "w") as f:
+        f.write("data")
+    with pytest.raises(FileExistsError):
+        ia.Store(urlpath, mode="w")
+    assert os.path.isfile(os.path.join(urlpath, "data.txt"))
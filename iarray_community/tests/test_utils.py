@@ -91,3 +91,16 @@ def test_open(shape, chunks, blocks, chunks2, blocks2, dtype, const):
 
     if os.path.exists(urlpath):
         ia.remove(urlpath)
+
+
+@pytest.mark.parametrize("contiguous", [None, True, False])
+def test_contiguous(contiguous):
+    urlpath = "test_contiguous.iarray"
+    if os.path.exists(urlpath):
+        ia.remove(urlpath)
+
+    ia.zeros((100,), chunks=(10,), blocks=(5,), urlpath=urlpath, contiguous=contiguous)
+    # Persistent arrays are a single (contiguous) file unless asked otherwise
+    assert os.path.isfile(urlpath) == (contiguous is not False)
+    np.testing.assert_array_equal(ia.open(urlpath)[:], 0)
+    ia.remove(urlpath)
@@ -0,0 +1,56 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "shape, chunks, blocks, key, key2"
+shapes_values = [
+    ((100,), (30,), (10,), slice(5, 95), slice(10, 70)),
+    ((55, 123), (10, 12), (2, 3), (slice(3, 50), slice(7, 100)), (slice(1, 40), 5)),
+    ((20, 30, 40), (10, 12, 25), (2, 3, 7), (slice(1, 19), 4, slice(3, 40)), (slice(2, 3), slice(4, 30))),
+]
+dtype_names = "dtype"
+dtype_values = [
+    np.float64,
+    np.int32,
+]
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize(dtype_names, dtype_values)
+def test_view(shape, chunks, blocks, key, key2, dtype):
+    data = np.arange(int(np.prod(shape)), dtype=dtype).reshape(shape)
+    a = ia.numpy2iarray(data, chunks=chunks, blocks=blocks)
+
+    v = a.view[key]
+    w = v.view[key2]
+    nv = data[key]
+    nw = nv[key2]
+    assert v.shape == nv.shape
+    assert w.shape == nw.shape
+    np.testing.assert_array_equal(v[:], nv)
+    np.testing.assert_array_equal(w[...], nw)
+    np.testing.assert_array_equal(np.array(list(v)), nv)
+
+    for axis in [None] + list(range(v.ndim)):
+        np.testing.assert_allclose(v.sum(axis=axis), nv.sum(axis=axis))
+        np.testing.assert_allclose(v.mean(axis=axis), nv.mean(axis=axis))
+        np.testing.assert_array_equal(v.min(axis=axis), nv.min(axis=axis))
+        np.testing.assert_array_equal(w.max(axis=axis if axis is None or axis < w.ndim else None),
+                                      nw.max(axis=axis if axis is None or axis < w.ndim else None))
+
+    b = w.copy(chunks=w.chunks, blocks=w.chunks)
+    assert isinstance(b, ia.IArray)
+    np.testing.assert_array_equal(b[...], nw)
+    b = w.copy()
+    assert b.chunks == tuple(min(c, s) for c, s in zip(w.chunks, w.shape))
+    np.testing.assert_array_equal(b[...], nw)
+
+
+def test_slice():
+    data = np.arange(1000.).reshape(10, 100)
+    a = ia.numpy2iarray(data, chunks=(4, 30), blocks=(2, 10))
+    b = ia.slice(a, (3, slice(15, 55)), chunks=(8,), blocks=(4,))
+    np.testing.assert_array_equal(b[:], data[3, 15:55])
+    # Length 1 dims are kept
+    np.testing.assert_array_equal(a[8:9, 5:7], data[8:9, 5:7])
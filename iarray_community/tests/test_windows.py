@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+import iarray_community as ia
+
+
+shapes_names = "shape, chunks, blocks"
+shapes_values = [
+    ((100, 80), (30, 20), (10, 10)),
+    ((20, 15, 12), (7, 8, 5), (3, 4, 5)),
+    ((5000,), (700,), (100,)),
+]
+
+
+def laplacian(block):
+    out = np.zeros_like(block)
+    inner = tuple(slice(1, -1) for _ in range(block.ndim))
+    for axis in range(block.ndim):
+        out[inner] += np.diff(block, 2, axis=axis)[tuple(slice(None) if i == axis else slice(1, -1)
+                                                         for i in range(block.ndim))]
+    return out
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("boundary, mode", [("reflect", "reflect"), ("symmetric", "symmetric"),
+                                            ("nearest", "edge"), ("periodic", "wrap"), (1.5, "constant")])
+def test_map_overlap(shape, chunks, blocks, boundary, mode):
+    an = np.random.default_rng(0).normal(size=shape)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+
+    b = ia.map_overlap(laplacian, a, 2, boundary=boundary)
+    assert b.chunks == a.chunks
+    pad_kwargs = {"constant_values": boundary} if mode == "constant" else {}
+    expected = laplacian(np.pad(an, 2, mode=mode, **pad_kwargs))[tuple(slice(2, -2) for _ in shape)]
+    np.testing.assert_allclose(b[...], expected)
+
+
+def test_map_overlap_depth():
+    an = np.arange(30 * 40).reshape(30, 40)
+    a = ia.numpy2iarray(an, chunks=(10, 15), blocks=(5, 5))
+
+    # The halo is not added outside the array with the "none" boundary
+    shapes = []
+    b = ia.map_overlap(lambda x: shapes.append(x.shape) or x, a, ((3, 1), (0, 2)), boundary="none")
+    np.testing.assert_array_equal(b[...], an)
+    assert sorted(set(shapes)) == [(11, 10), (11, 17), (13, 10), (13, 17), (14, 10), (14, 17)]
+
+    # Without trimming, func returns the data for the chunk only
+    b = ia.map_overlap(lambda x: x[1:-1, :-2] - x[:-2, :-2], a, ((1, 1), (0, 2)), boundary=0, trim=False,
+                       dtype=np.float64, chunks=(20, 20), blocks=(10, 10))
+    assert b.dtype == np.float64 and b.chunks == (20, 20)
+    np.testing.assert_array_equal(b[...], np.diff(an, axis=0, prepend=0))
+
+
+def test_map_overlap_errors():
+    a = ia.arange(0, 100, shape=(10, 10), chunks=(5, 5), blocks=(5, 5))
+    with pytest.raises(ValueError):
+        ia.map_overlap(lambda x: x, a, (1, 1, 1))
+    with pytest.raises(ValueError):
+        ia.map_overlap(lambda x: x, a, 1, boundary="mirror")
+    with pytest.raises(ValueError):
+        ia.map_overlap(lambda x: x, a, 10, boundary="reflect")
+    with pytest.raises(ValueError):
+        ia.map_overlap(lambda x: x[1:-1, 1:-1], a, 1)
+
+
+def rolling_reference(an, window, axis, center, reduce):
+    before = window // 2 if center else window - 1
+    pad = [(0, 0)] * an.ndim
+    pad[axis] = (before, window - 1 - before)
+    padded = np.pad(an.astype(np.float64), pad, constant_values=np.nan)
+    return reduce(np.lib.stride_tricks.sliding_window_view(padded, window, axis=axis), axis=-1)
+
+
+@pytest.mark.parametrize(shapes_names, shapes_values)
+@pytest.mark.parametrize("window, axis, center", [(1, 0, False), (5, 0, False), (4, -1, True), (9, -1, False)])
+def test_rolling(shape, chunks, blocks, window, axis, center):
+    an = np.random.default_rng(0).integers(-100, 100, size=shape, dtype=np.int32)
+    a = ia.numpy2iarray(an, chunks=chunks, blocks=blocks)
+
+    r = ia.rolling(a, window, axis, center)
+    for name in ["sum", "mean", "min", "max"]:
+        b = getattr(r, name)()
+        assert b.dtype == np.float64
+        np.testing.assert_allclose(b[...], rolling_reference(an, window, axis, center, getattr(np, name)))
@@ -1,7 +1,19 @@
 import numpy as np
 import iarray_community as ia
 import caterva as cat
+from caterva.ndarray import get_caterva_start_stop
+import os
+import time
+import builtins
+from . import instrument
 from .constructors import add_meta
+from .iarray import chunk_slices, process_key
+from .columns import ColumnArray, COLUMNS_INDEX
+from .store import Store, STORE_INDEX
+
+# Approximate size (in bytes) of the default chunks in stack, which groups several arrays per chunk
+STACK_CHUNK_NBYTES = 2**22
+
 
 def iarray2numpy(iarr) -> np.ndarray:
     """Convert an ironArray array into a NumPy array.
@@ -42,33 +54,213 @@ def numpy2iarray(ndarray, **kwargs) -> ia.IArray:
     --------
     iarray2numpy
     """
+    t0 = time.perf_counter()
     with ia.config(**kwargs) as cfg:
         kwargs = cfg.kwargs
         kwargs["dtype"] = np.dtype(ndarray.dtype)
+        if cfg.columnar and ndarray.dtype.names is not None:
+            cfg = cfg._replace(dtype=ndarray.dtype)
+            return ColumnArray.create(cfg, lambda name, **kw: numpy2iarray(np.ascontiguousarray(ndarray[name]), **kw))
         arr = ia.IArray(**kwargs)
         kwargs = add_meta(arr.dtype, **arr._cfg.cat_kwargs)
         cat.ext.asarray(arr, ndarray, **kwargs)
-        return arr
+    instrument.emit("create", arr, t0)
+    return arr
 
 
 def slice(array, key, **kwargs):
+    """Return a new array with the data in `array[key]`.
+
+    `kwargs` are the same than for :func:`empty`.
+
+    Parameters
+    ----------
+    array : IArray
+        The array to get the slice from.
+    key : int, slice or sequence of slices
+        The region to get.  Steps in slices are not supported.
+
+    Returns
+    -------
+    IArray
+        The new array.
+
+    See Also
+    --------
+    IArray.view
+    """
+    t0 = time.perf_counter()
+    array._flush_writes()
+    key, mask = process_key(key, array.shape)
+    start, stop, _ = get_caterva_start_stop(array.ndim, key, array.shape)
     with ia.config(**kwargs) as cfg:
+        # Caterva expects the chunks and blocks for the dims removed by integer indices too
+        unsqueeze = {}
+        for name in ("chunks", "blocks"):
+            value = getattr(cfg, name)
+            if value is not None and len(value) == mask.count(False) < len(mask):
+                value = iter(value)
+                unsqueeze[name] = tuple(1 if m else next(value) for m in mask)
+        cfg = cfg._replace(**unsqueeze)
         kwargs = cfg.kwargs
         kwargs["dtype"] = np.dtype(array.dtype)
         arr = ia.IArray(**kwargs)
         kwargs = add_meta(arr.dtype, **arr._cfg.cat_kwargs)
-        cat.ext.slice(arr, array, key, **kwargs)
+        cat.ext.get_slice(arr, array, (start, stop), mask, **kwargs)
 
+    instrument.emit("slice", arr, t0)
     return arr
 
 def copy(array, **kwargs):
+    """Return a copy of `array`.
+
+    `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set,
+    the ones in `array` are used.  When the chunks, blocks, codec, level and filters for the copy
+    are the same than in `array`, the compressed chunks are copied as-is, without being
+    decompressed and compressed again.
+
+    Parameters
+    ----------
+    array : IArray, ColumnArray
+        The array to copy.
+
+    Returns
+    -------
+    IArray, ColumnArray
+        The copy.
+
+    See Also
+    --------
+    concatenate
+    """
+    t0 = time.perf_counter()
     with ia.config(**kwargs) as cfg:
+        if cfg.chunks is None and cfg.blocks is None:
+            cfg = cfg._replace(chunks=array.chunks, blocks=array.blocks)
         kwargs = cfg.kwargs
         kwargs["dtype"] = np.dtype(array.dtype)
-        arr = ia.IArray(**kwargs)
-        kwargs = add_meta(arr.dtype, **arr._cfg.cat_kwargs)
-        cat.ext.copy(arr, array, **kwargs)
+        if cfg.columnar and array.dtype.names is not None:
+            cfg = cfg._replace(dtype=array.dtype)
+            if isinstance(array, ColumnArray):
+                return ColumnArray.create(cfg, lambda name, **kw: copy(array[name], **kw))
+            arr = ia.empty(array.shape, **cfg.kwargs)
+        elif isinstance(array, ColumnArray):
+            arr = ia.empty(array.shape, **kwargs)
+        else:
+            array._flush_writes()
+            arr = ia.IArray(**kwargs)
+            kwargs = add_meta(arr.dtype, **arr._cfg.cat_kwargs)
+            cat.ext.copy(arr, array, **kwargs)
+            instrument.emit("copy", arr, t0)
+            return arr
+
+    # Switching between row and columnar layouts goes through decompressed chunks
+    for key in chunk_slices(arr.shape, arr.chunks):
+        arr[key] = array[key]
+    return arr
+
+
+def concatenate(arrays, axis=0, **kwargs):
+    """Join a sequence of arrays along an existing axis.
+
+    `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set,
+    the ones in the first array are used.
+
+    The first array is copied with :func:`copy`, so its compressed chunks are reused as-is
+    when the params match.  The other arrays are decompressed and recompressed into the chunks
+    of the output, one chunk of the output at a time; this includes the chunk shared with the
+    end of the previous array when its length in `axis` is not a multiple of the chunks.
+
+    Parameters
+    ----------
+    arrays : sequence of IArray
+        The arrays to join.  They must have the same dtype and shape, except in `axis`.
+    axis : int
+        The axis along which the arrays are joined.  Default is 0.
+
+    Returns
+    -------
+    IArray
+        The new array.
+
+    See Also
+    --------
+    stack
+    """
+    first = arrays[0]
+    if not -first.ndim <= axis < first.ndim:
+        raise ValueError(f"axis {axis} is out of bounds for an array of dimension {first.ndim}")
+    axis %= first.ndim
+    shape = list(first.shape)
+    for array in arrays[1:]:
+        if array.dtype != first.dtype:
+            raise ValueError("All the arrays must have the same dtype")
+        if array.ndim != first.ndim or any(s != fs for d, (s, fs) in enumerate(zip(array.shape, first.shape))
+                                           if d != axis):
+            raise ValueError("All the arrays must have the same shape, except in the concatenation axis")
+        shape[axis] += array.shape[axis]
+
+    arr = copy(first, **kwargs)
+    arr.resize(shape)
+    offset = first.shape[axis]
+    for array in arrays[1:]:
+        region = [0] * arr.ndim
+        region[axis] = offset
+        for key in chunk_slices(array.shape, arr.chunks, region):
+            out_key = list(key)
+            out_key[axis] = builtins.slice(key[axis].start + offset, key[axis].stop + offset)
+            arr[tuple(out_key)] = array[key]
+        offset += array.shape[axis]
+    return arr
+
+
+def stack(arrays, axis=0, **kwargs):
+    """Join a sequence of arrays along a new axis.
+
+    `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set,
+    the ones in the first array are used, with as many arrays along the new axis as fit in
+    chunks of about :data:`STACK_CHUNK_NBYTES` (4 MB), and 1 in the blocks.
+
+    All the arrays are decompressed and recompressed into the chunks of the output, one chunk
+    of the output at a time.
+
+    Parameters
+    ----------
+    arrays : sequence of IArray
+        The arrays to join.  They must have the same dtype and shape.
+    axis : int
+        The position of the new axis in the result.  Default is 0.
+
+    Returns
+    -------
+    IArray
+        The new array.
+
+    See Also
+    --------
+    concatenate
+    """
+    first = arrays[0]
+    if not -first.ndim - 1 <= axis <= first.ndim:
+        raise ValueError(f"axis {axis} is out of bounds for an array of dimension {first.ndim + 1}")
+    axis %= first.ndim + 1
+    for array in arrays[1:]:
+        if array.dtype != first.dtype or array.shape != first.shape:
+            raise ValueError("All the arrays must have the same dtype and shape")
+    shape = first.shape[:axis] + (len(arrays),) + first.shape[axis:]
+
+    with ia.config(**kwargs) as cfg:
+        if cfg.chunks is None and cfg.blocks is None:
+            chunk_nbytes = int(np.prod(first.chunks)) * first.dtype.itemsize
+            n = min(len(arrays), max(STACK_CHUNK_NBYTES // chunk_nbytes, 1))
+            chunks = first.chunks[:axis] + (n,) + first.chunks[axis:]
+            blocks = first.blocks[:axis] + (1,) + first.blocks[axis:]
+            cfg = cfg._replace(chunks=chunks, blocks=blocks)
+        arr = ia.empty(shape, **dict(cfg.kwargs, dtype=first.dtype))
 
+    for key in chunk_slices(arr.shape, arr.chunks):
+        inner = key[:axis] + key[axis + 1:]
+        arr[key] = np.stack([arrays[i][inner] for i in range(key[axis].start, key[axis].stop)], axis)
     return arr
 
 
@@ -84,9 +276,17 @@ def open(urlpath):
     Returns
     -------
     IArray
-        The new opened array.
+        The new opened array.  Column arrays (see :class:`ColumnArray`) and stores (see
+        :class:`Store`) are opened too.
 
     """
+    if os.path.exists(os.path.join(urlpath, COLUMNS_INDEX)):
+        return ColumnArray.open(urlpath)
+    if os.path.exists(os.path.join(urlpath, STORE_INDEX)):
+        return Store(urlpath)
+
+    t0 = time.perf_counter()
+
     arr = cat.NDArray()
     cat.ext.from_file(arr, urlpath)
 
@@ -95,8 +295,49 @@ def open(urlpath):
     else:
         raise AttributeError(f"File {urlpath} not contains an ironArray object")
 
+    instrument.emit("open", arr, t0)
     return arr
 
 
+def from_cframe(buffer, urlpath=None):
+    """Get an array from a contiguous frame, as returned by :meth:`IArray.to_cframe`.
+
+    The compressed chunks in the frame are copied as-is (no recompression).  For an in-memory
+    array, the frame is first written to a file in a temporary directory, since caterva can only
+    open frames from files, and copied from there into memory.
+
+    Parameters
+    ----------
+    buffer : bytes-like
+        The frame.
+    urlpath : str, optional
+        If given, the frame is written to this file and the array is opened from it.
+        Otherwise (the default) an in-memory array is returned.
+
+    Returns
+    -------
+    IArray
+        The array in the frame.
+    """
+    if urlpath is not None:
+        if os.path.exists(urlpath):
+            raise FileExistsError("Remove file first!")
+        with builtins.open(urlpath, "wb") as f:
+            f.write(memoryview(buffer))
+        return open(urlpath)
+
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        frame = from_cframe(buffer, os.path.join(tmpdir, "frame.iarray"))
+        kwargs = add_meta(frame.dtype, chunks=frame.chunks, blocks=frame.blocks, codec=frame.codec,
+                          clevel=frame.clevel, usedict=False, nthreads=frame._nthreads, filters=frame.filters,
+                          filtersmeta=[0] * len(frame.filters), urlpath=None, contiguous=False)
+        arr = cat.NDArray(**kwargs)
+        cat.ext.copy(arr, frame, **kwargs)
+        del frame
+    return ia.IArray.cast(arr)
+
+
 def remove(urlpath):
     cat.remove(urlpath)
@@ -0,0 +1,150 @@
+import numpy as np
+from .iarray import process_key
+import iarray_community as ia
+from .iarray import chunk_slices
+from . import reductions
+
+
+class ViewIndexer(object):
+    """Create views with ``obj.view[key]``."""
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __getitem__(self, key):
+        return self.obj._subview(key)
+
+
+class IArrayView(object):
+    """A lazy view of a region of an :class:`IArray`.
+
+    Views are created with ``arr.view[key]`` and only keep a reference to the parent array
+    along with the region, so no data is decompressed or compressed until it is read.  Only
+    integers and slices without a step are supported in `key`.
+
+    Views can be indexed (returning a NumPy array), iterated over their first dimension,
+    reduced chunk by chunk with :meth:`sum`, :meth:`prod`, :meth:`min`, :meth:`max` and
+    :meth:`mean`, and sliced again with ``view.view[key]``.  Use :meth:`copy` for getting
+    a new compressed array with the data in the view.
+    """
+
+    def __init__(self, parent, start=None, stop=None, dims=None):
+        self.parent = parent
+        self.start = tuple(start) if start is not None else (0,) * parent.ndim
+        self.stop = tuple(stop) if stop is not None else tuple(parent.shape)
+        # The dims of the parent that are kept (integer indices remove dims)
+        self.dims = tuple(dims) if dims is not None else tuple(range(parent.ndim))
+
+    @property
+    def shape(self):
+        return tuple(self.stop[d] - self.start[d] for d in self.dims)
+
+    @property
+    def ndim(self):
+        return len(self.dims)
+
+    @property
+    def dtype(self):
+        return self.parent.dtype
+
+    @property
+    def chunks(self):
+        return tuple(self.parent.chunks[d] for d in self.dims)
+
+    @property
+    def nbytes(self):
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+    @property
+    def view(self):
+        """
+        Get lazy views of this view with ``view.view[key]``.
+        """
+        return ViewIndexer(self)
+
+    @property
+    def data(self):
+        """
+        Get a ndarray with the view data.
+        """
+        return self[()]
+
+    @property
+    def _nthreads(self):
+        return self.parent._nthreads
+
+    def __repr__(self):
+        region = ", ".join(f"{self.start[d]}:{self.stop[d]}" if d in self.dims else str(self.start[d])
+                           for d in range(self.parent.ndim))
+        return f"<IArrayView [{region}] shape={self.shape} dtype={self.dtype}>"
+
+    def __len__(self):
+        if self.ndim == 0:
+            raise TypeError("len() of a 0-d view")
+        return self.shape[0]
+
+    def _parent_key(self, key):
+        key, mask = process_key(key, self.shape)
+        pkey = []
+        i = 0
+        for d in range(self.parent.ndim):
+            if d not in self.dims:
+                pkey.append(self.start[d])
+                continue
+            k, m = key[i], mask[i]
+            i += 1
+            if k.step not in (None, 1):
+                raise IndexError("Steps are not supported in views")
+            start = self.start[d] + k.start
+            pkey.append(start if m else slice(start, self.start[d] + k.stop))
+        return tuple(pkey)
+
+    def _subview(self, key):
+        pkey = self._parent_key(key)
+        start = [k.start if isinstance(k, slice) else k for k in pkey]
+        stop = [k.stop if isinstance(k, slice) else k + 1 for k in pkey]
+        dims = [d for d, k in enumerate(pkey) if isinstance(k, slice)]
+        return IArrayView(self.parent, start, stop, dims)
+
+    def _chunk_keys(self):
+        offset = tuple(self.start[d] for d in self.dims)
+        return chunk_slices(self.shape, self.chunks, offset)
+
+    def __getitem__(self, key):
+        return self.parent[self._parent_key(key)]
+
+    def __iter__(self):
+        if self.ndim == 0:
+            raise TypeError("iteration over a 0-d view")
+        # Decompress a slab of chunks along the first dim at a time
+        start = self.start[self.dims[0]]
+        for key in chunk_slices(self.shape[:1], self.chunks[:1], (start,)):
+            yield from self[key]
+
+    def sum(self, axis=None):
+        return reductions.reduce(self, "sum", axis)
+
+    def prod(self, axis=None):
+        return reductions.reduce(self, "prod", axis)
+
+    def min(self, axis=None):
+        return reductions.reduce(self, "min", axis)
+
+    def max(self, axis=None):
+        return reductions.reduce(self, "max", axis)
+
+    def mean(self, axis=None):
+        return reductions.reduce(self, "mean", axis)
+
+    def copy(self, **kwargs):
+        """Return a new compressed array with the data in the view.
+
+        `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set,
+        the ones in the parent array (clipped to the shape of the view) are used.
+        """
+        with ia.config(**kwargs) as cfg:
+            if cfg.chunks is None and cfg.blocks is None:
+                chunks = tuple(max(1, min(c, s)) for c, s in zip(self.chunks, self.shape))
+                blocks = tuple(min(self.parent.blocks[d], c) for d, c in zip(self.dims, chunks))
+                cfg = cfg._replace(chunks=chunks, blocks=blocks)
+            return ia.slice(self.parent, self._parent_key(()), **cfg.kwargs)
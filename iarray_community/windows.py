@@ -0,0 +1,207 @@
+import itertools
+import numpy as np
+import iarray_community as ia
+from .buffers import ChunkCache
+from .constructors import fill_chunks
+
+
+_boundary_modes = ("reflect", "symmetric", "nearest", "periodic", "none")
+
+
+def _normalize_depth(depth, ndim):
+    if np.isscalar(depth):
+        depth = (depth,) * ndim
+    if len(depth) != ndim:
+        raise ValueError(f"depth must have {ndim} elements, one for every dimension")
+    depth = tuple((int(d), int(d)) if np.isscalar(d) else (int(d[0]), int(d[1])) for d in depth)
+    if any(d < 0 for pair in depth for d in pair):
+        raise ValueError("depth cannot be negative")
+    return depth
+
+
+def _halo_indices(start, stop, before, after, n, boundary):
+    """Return the indices (along a dimension of length `n`) of the elements in a chunk with its halo.
+
+    Indices outside the array are mapped inside it according to `boundary`, or are -1 where the
+    boundary is a constant value.  With the ``"none"`` boundary they are left out.
+    """
+    idx = np.arange(start - before, stop + after)
+    if boundary == "none":
+        return idx[(idx >= 0) & (idx < n)]
+    if boundary == "reflect":
+        idx = np.abs(idx)
+        return np.where(idx >= n, 2 * (n - 1) - idx, idx)
+    if boundary == "symmetric":
+        idx = np.where(idx < 0, -idx - 1, idx)
+        return np.where(idx >= n, 2 * n - 1 - idx, idx)
+    if boundary == "nearest":
+        return np.clip(idx, 0, n - 1)
+    if boundary == "periodic":
+        return idx % n
+    return np.where((idx < 0) | (idx >= n), -1, idx)
+
+
+def _as_slice(idx):
+    if len(idx) > 0 and idx[-1] - idx[0] == len(idx) - 1 and np.all(np.diff(idx) == 1):
+        return slice(int(idx[0]), int(idx[-1]) + 1)
+    return idx
+
+
+def _gather(cache, indices, dtype, fill_value):
+    """Return the elements in the outer product of `indices`, reading the chunks from `cache`."""
+    out = np.empty(tuple(len(idx) for idx in indices), dtype=dtype)
+    if any(np.any(idx < 0) for idx in indices):
+        out[...] = fill_value
+    # For every dimension, the chunks with their positions in `out` and in the chunk
+    parts = []
+    for idx, c in zip(indices, cache.arr.chunks):
+        ids = np.where(idx >= 0, idx // c, -1)
+        dim_parts = []
+        for cid in np.unique(ids[ids >= 0]):
+            pos = np.nonzero(ids == cid)[0]
+            dim_parts.append((int(cid) * c, _as_slice(pos), _as_slice(idx[pos] - cid * c)))
+        parts.append(dim_parts)
+    for combination in itertools.product(*parts):
+        chunk = cache.get(tuple(p[0] for p in combination))
+        dst, src = tuple(p[1] for p in combination), tuple(p[2] for p in combination)
+        if not all(isinstance(k, slice) for k in dst + src):
+            # Mixing slices and index arrays needs an outer product of the indices
+            dst = np.ix_(*[np.arange(k.start, k.stop) if isinstance(k, slice) else k for k in dst])
+            src = np.ix_(*[np.arange(k.start, k.stop) if isinstance(k, slice) else k for k in src])
+        out[dst] = chunk[src]
+    return out
+
+
+def map_overlap(func, a, depth, boundary="reflect", trim=True, dtype=None, max_mem=2**28, **kwargs):
+    """Apply `func` to every chunk of `a` extended with `depth` elements from its neighbours.
+
+    This is useful for stencils, convolutions and other window operations needing the data
+    across chunk boundaries.  The chunks of `a` are decompressed once and shared by the
+    neighbouring chunks (with their halos), with up to `max_mem` bytes of decompressed chunks
+    kept in memory.
+
+    `kwargs` are the same than for :func:`empty`.  If neither `chunks` nor `blocks` are set,
+    the ones in `a` are used.
+
+    Parameters
+    ----------
+    func : callable
+        A function getting a NumPy array with the data for a chunk with its halo.
+    a : IArray
+        The input array.
+    depth : int or tuple
+        The number of elements of the halo, for all the dimensions, or for every dimension as
+        an int or a ``(before, after)`` pair.
+    boundary : str or scalar
+        How the halo is filled outside the array: ``"reflect"``, ``"symmetric"``, ``"nearest"``
+        or ``"periodic"`` (as the `mode` in :func:`numpy.pad`, ``"periodic"`` being ``"wrap"``),
+        a constant value, or ``"none"`` for no halo outside the array.
+    trim : bool
+        If true, `func` returns an array with the shape of its input and the halo is removed
+        from it.  Else, `func` returns the data for the chunk without the halo.
+    dtype : np.dtype
+        The data type of the result.  The one of `a` by default.
+
+    Returns
+    -------
+    IArray
+        The result of `func` for all the chunks.
+    """
+    depth = _normalize_depth(depth, a.ndim)
+    if isinstance(boundary, str):
+        if boundary not in _boundary_modes:
+            raise ValueError(f"boundary must be one of {_boundary_modes} or a constant value")
+        fill_value = None
+        block_dtype = a.dtype
+    else:
+        fill_value, boundary = boundary, "constant"
+        block_dtype = np.result_type(a.dtype, fill_value)
+    for (before, after), n in zip(depth, a.shape):
+        if boundary in ("reflect", "symmetric") and max(before, after) > n - (boundary == "reflect"):
+            raise ValueError(f"depth {max(before, after)} is too large for the {boundary!r} boundary "
+                             f"in a dimension with {n} elements")
+
+    with ia.config(**kwargs) as cfg:
+        if cfg.chunks is None and cfg.blocks is None:
+            cfg = cfg._replace(chunks=a.chunks, blocks=a.blocks)
+        out = ia.empty(a.shape, **dict(cfg.kwargs, dtype=a.dtype if dtype is None else dtype))
+
+    a._flush_writes()
+    cache = ChunkCache(a, max_mem)
+
+    def chunk(index, key):
+        indices = [_halo_indices(k.start, k.stop, before, after, n, boundary)
+                   for k, (before, after), n in zip(key, depth, a.shape)]
+        block = _gather(cache, indices, block_dtype, fill_value)
+        result = np.asarray(func(block))
+        if not trim:
+            return result
+        if result.shape != block.shape:
+            raise ValueError(f"func returned an array with shape {result.shape} for an input with shape "
+                             f"{block.shape}; use trim=False if it removes the halo itself")
+        crop = []
+        for k, (before, after) in zip(key, depth):
+            start = min(before, k.start) if boundary == "none" else before
+            crop.append(slice(start, start + k.stop - k.start))
+        return result[tuple(crop)]
+
+    return fill_chunks(out, chunk)
+
+
+class Rolling(object):
+    """Rolling window computations along an axis of an array, as returned by :func:`rolling`."""
+
+    def __init__(self, a, window, axis=0, center=False):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        if not -a.ndim <= axis < a.ndim:
+            raise ValueError(f"axis {axis} is out of bounds for an array with {a.ndim} dimensions")
+        self.a = a
+        self.window = int(window)
+        self.axis = axis % a.ndim
+        self.center = center
+
+    def _apply(self, reduce, **kwargs):
+        before = self.window // 2 if self.center else self.window - 1
+        depth = [(0, 0)] * self.a.ndim
+        depth[self.axis] = (before, self.window - 1 - before)
+        dtype = self.a.dtype if self.a.dtype.kind == "f" else np.dtype(np.float64)
+
+        def func(block):
+            windows = np.lib.stride_tricks.sliding_window_view(block.astype(dtype, copy=False), self.window,
+                                                               axis=self.axis)
+            return reduce(windows, axis=-1)
+
+        return map_overlap(func, self.a, depth, boundary=np.nan, trim=False, dtype=dtype, **kwargs)
+
+    def sum(self, **kwargs):
+        """Return the sum over the windows.  `kwargs` are the same than for :func:`map_overlap`."""
+        return self._apply(np.sum, **kwargs)
+
+    def mean(self, **kwargs):
+        """Return the mean over the windows.  `kwargs` are the same than for :func:`map_overlap`."""
+        return self._apply(np.mean, **kwargs)
+
+    def min(self, **kwargs):
+        """Return the minimum over the windows.  `kwargs` are the same than for :func:`map_overlap`."""
+        return self._apply(np.min, **kwargs)
+
+    def max(self, **kwargs):
+        """Return the maximum over the windows.  `kwargs` are the same than for :func:`map_overlap`."""
+        return self._apply(np.max, **kwargs)
+
+
+def rolling(a, window, axis=0, center=False):
+    """Return an object for computing reductions over rolling windows along `axis` of `a`.
+
+    The result at every position is the reduction over the `window` elements ending there (or
+    centered there if `center` is true), and NaN where the window does not fit in the array,
+    as in pandas.  Results are floating point.
+
+    Examples
+    --------
+    >>> a = ia.arange(10, chunks=(4,), blocks=(2,))
+    >>> ia.rolling(a, 3).mean()[...]
+    array([nan, nan,  1.,  2.,  3.,  4.,  5.,  6.,  7.,  8.])
+    """
+    return Rolling(a, window, axis, center)